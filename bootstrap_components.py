@@ -10,6 +10,29 @@ from presentation_layer import UIRenderer, BootstrapRenderer
 class ExtendedBootstrapRenderer(BootstrapRenderer):
     """Extended Bootstrap renderer with complete component library"""
 
+    RENDER_METHODS = {
+        **BootstrapRenderer.RENDER_METHODS,
+        'div': 'render_div',
+        'container': 'render_container',
+        'form': 'render_form',
+        'table': 'render_table',
+        'modal': 'render_modal',
+        'breadcrumb': 'render_breadcrumb',
+        'tabs': 'render_tabs',
+        'accordion': 'render_accordion',
+        'badge': 'render_badge',
+        'progress': 'render_progress',
+        'spinner': 'render_spinner',
+        'pagination': 'render_pagination',
+        'toast': 'render_toast',
+        'list_group': 'render_list_group',
+        'metric': 'render_metric',
+        'script': 'render_script',
+        'row': 'render_row',
+        'col': 'render_col',
+        'list': 'render_list',
+    }
+
     def __init__(self):
         super().__init__()  # Initialize parent class with scripts array
 
@@ -489,54 +512,6 @@ class ExtendedBootstrapRenderer(BootstrapRenderer):
 
         return f'<div {id_attr} {class_attr}>{inner_html}</div>'
 
-    def render(self, data: Any) -> str:
-        """Extended render method with new component types"""
-        if isinstance(data, dict):
-            component_type = data.get('type', '')
-
-            # Handle new component types
-            if component_type == 'div':
-                return self.render_div(data)
-            elif component_type == 'container':
-                return self.render_container(data)
-            elif component_type == 'form':
-                return self.render_form(data)
-            elif component_type == 'table':
-                return self.render_table(data)
-            elif component_type == 'modal':
-                return self.render_modal(data)
-            elif component_type == 'breadcrumb':
-                return self.render_breadcrumb(data)
-            elif component_type == 'tabs':
-                return self.render_tabs(data)
-            elif component_type == 'accordion':
-                return self.render_accordion(data)
-            elif component_type == 'badge':
-                return self.render_badge(data)
-            elif component_type == 'progress':
-                return self.render_progress(data)
-            elif component_type == 'spinner':
-                return self.render_spinner(data)
-            elif component_type == 'pagination':
-                return self.render_pagination(data)
-            elif component_type == 'toast':
-                return self.render_toast(data)
-            elif component_type == 'list_group':
-                return self.render_list_group(data)
-            elif component_type == 'metric':
-                return self.render_metric(data)
-            elif component_type == 'script':
-                return self.render_script(data)
-            elif component_type == 'row':
-                return self.render_row(data)
-            elif component_type == 'col':
-                return self.render_col(data)
-            elif component_type == 'list':
-                return self.render_list(data)
-
-        # Fall back to parent implementation
-        return super().render(data)
-
     def render_metric(self, data: Dict) -> str:
         """Render a metric card"""
         metric_id = data.get('id', '')
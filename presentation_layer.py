@@ -6,7 +6,19 @@ Converts data structures to different UI frameworks (Bootstrap, Tailwind, Materi
 
 from typing import Dict, List, Any, Union
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+import copy
+from html import escape
+from io import StringIO
 import json
+import re
+
+# Marks where a 'slot' node sits in HTML rendered by PresentationLayer.compile
+_SLOT_MARKER = '\x00slot\x00'
+_SLOT_SPLIT = re.compile(re.escape(_SLOT_MARKER) + r'(\d+)' + re.escape(_SLOT_MARKER))
+
+# {{name}} placeholders left in rendered HTML by template components
+_PLACEHOLDER = re.compile(r'\{\{\s*([A-Za-z_]\w*)\s*\}\}')
 
 # ============================================
 # Abstract Presentation Layer
@@ -15,6 +27,46 @@ import json
 class UIRenderer(ABC):
     """Abstract base class for UI renderers"""
 
+    # Slot nodes seen while compiling; None during a normal render
+    _compile_slots = None
+
+    # Component type -> render method name, resolved per subclass into _DISPATCH
+    RENDER_METHODS = {
+        'script': '_collect_script',
+        'page': 'render_page',
+        'navbar': 'render_navbar',
+        'card': 'render_card',
+        'button': 'render_button',
+        'grid': 'render_grid',
+        'alert': 'render_alert',
+        'hero': 'render_hero',
+        'form': 'render_form',
+        'raw': '_render_raw',
+        'footer': '_render_raw',
+        'text': 'render_text',
+        'slot': 'render_slot',
+    }
+
+    # Container types whose children stream into the caller's buffer via a _write_* method
+    WRITE_METHODS = {
+        'page': '_write_page',
+        'grid': '_write_grid',
+    }
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Look the methods up once so overrides are honoured and dispatch is a dict get
+        cls._DISPATCH = {component_type: getattr(cls, name)
+                         for component_type, name in cls.RENDER_METHODS.items()}
+        # A writer is only used alongside the render_* method it was written for, so a
+        # subclass that overrides render_grid (say) without a writer still gets its override
+        cls._WRITE_DISPATCH = {}
+        for component_type, name in cls.WRITE_METHODS.items():
+            render_name = cls.RENDER_METHODS.get(component_type)
+            owner = next((klass for klass in cls.__mro__ if render_name in vars(klass)), None)
+            if owner is not None and name in vars(owner):
+                cls._WRITE_DISPATCH[component_type] = getattr(cls, name)
+
     @abstractmethod
     def render_page(self, data: Dict) -> str:
         pass
@@ -45,47 +97,75 @@ class UIRenderer(ABC):
             return data
 
         if isinstance(data, list):
-            return ''.join(self.render(item) for item in data)
+            return ''.join([self.render(item) for item in data])
 
         if isinstance(data, dict):
+            # A leaf component's render_* already returns its HTML - no buffer needed
             component_type = data.get('type', '')
+            method = self._DISPATCH.get(component_type)
+            if method is not None and component_type not in self._WRITE_DISPATCH:
+                return method(self, data)
+
+        out = StringIO()
+        self._render_into(data, out)
+        return out.getvalue()
+
+    def _render_into(self, data: Union[Dict, List, str], out: StringIO) -> None:
+        """Write rendered HTML for data into an output buffer; lists and containers recurse into it"""
+        if isinstance(data, str):
+            out.write(data)
+            return
 
-            # Handle script components specially - collect them but don't render inline
-            if component_type == 'script':
-                if hasattr(self, 'scripts'):
-                    content = data.get('content', '')
-                    self.scripts.append(f'<script>{content}</script>')
-                return ''  # Don't render inline
+        if isinstance(data, list):
+            for item in data:
+                self._render_into(item, out)
+            return
 
+        if isinstance(data, dict):
             # Route to specific renderer based on type
-            if component_type == 'page':
-                return self.render_page(data)
-            elif component_type == 'navbar':
-                return self.render_navbar(data)
-            elif component_type == 'card':
-                return self.render_card(data)
-            elif component_type == 'button':
-                return self.render_button(data)
-            elif component_type == 'grid':
-                return self.render_grid(data)
-            elif component_type == 'alert':
-                return self.render_alert(data)
-            elif component_type == 'hero':
-                return self.render_hero(data)
-            elif component_type == 'form':
-                return self.render_form(data)
-            elif component_type == 'raw':
-                # Raw HTML content - pass through directly
-                return data.get('content', '')
-            elif component_type == 'footer':
-                # Footer is just raw HTML
-                return data.get('content', '')
+            component_type = data.get('type', '')
+            writer = self._WRITE_DISPATCH.get(component_type)
+            if writer is not None:
+                return writer(self, data, out)
+            method = self._DISPATCH.get(component_type)
+            if method is not None:
+                return out.write(method(self, data))
             elif 'components' in data:
-                return self.render(data['components'])
+                return self._render_into(data['components'], out)
             elif 'items' in data:
-                return self.render(data['items'])
+                return self._render_into(data['items'], out)
+
+        out.write(str(data))
+
+    def _buffered(self, writer, data: Dict) -> str:
+        """Run a _write_* method against a fresh buffer and return the HTML"""
+        out = StringIO()
+        writer(data, out)
+        return out.getvalue()
+
+    def _collect_script(self, data: Dict) -> str:
+        """Handle script components specially - collect them but don't render inline"""
+        if hasattr(self, 'scripts'):
+            content = data.get('content', '')
+            self.scripts.append(f'<script>{content}</script>')
+        return ''  # Don't render inline
+
+    def _render_raw(self, data: Dict) -> str:
+        """Raw HTML content (and footers) - pass through directly"""
+        return data.get('content', '')
+
+    def render_text(self, data: Dict) -> str:
+        """Plain text, HTML-escaped (once, when the structure is compiled)"""
+        return escape(str(data.get('text', '')))
 
-        return str(data)
+    def render_slot(self, data: Dict) -> str:
+        """Render a dynamic hole - its default value, or a marker when compiling"""
+        if self._compile_slots is None:
+            default = str(data.get('default', ''))
+            return escape(default) if data.get('escape') else default
+
+        self._compile_slots.append(data)
+        return f'{_SLOT_MARKER}{len(self._compile_slots) - 1}{_SLOT_MARKER}'
 
     def render_hero(self, data: Dict) -> str:
         """Default hero implementation"""
@@ -107,14 +187,13 @@ class BootstrapRenderer(UIRenderer):
         self.scripts = []  # Collect scripts during rendering
 
     def render_page(self, data: Dict) -> str:
+        return self._buffered(self._write_page, data)
+
+    def _write_page(self, data: Dict, out: StringIO) -> None:
         title = data.get('title', 'DBBasic')
         self.scripts = []  # Reset scripts for this page
-        components = self.render(data.get('components', []))
 
-        # Collect all scripts
-        scripts_html = '\n'.join(self.scripts)
-
-        return f"""<!DOCTYPE html>
+        out.write(f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -125,12 +204,17 @@ class BootstrapRenderer(UIRenderer):
     {self._get_custom_styles()}
 </head>
 <body>
-    {components}
+    """)
+        self._render_into(data.get('components', []), out)
+
+        # Scripts collected while the components rendered
+        scripts_html = '\n'.join(self.scripts)
+        out.write(f"""
     <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/js/bootstrap.bundle.min.js"></script>
     {scripts_html}
     {self._get_scripts()}
 </body>
-</html>"""
+</html>""")
 
     def render_navbar(self, data: Dict) -> str:
         brand = data.get('brand', 'DBBasic')
@@ -281,15 +365,24 @@ class BootstrapRenderer(UIRenderer):
         return f'<button class="btn btn-{data.get("variant", "primary")}">{data.get("text", "Button")}</button>'
 
     def render_grid(self, data: Dict) -> str:
+        return self._buffered(self._write_grid, data)
+
+    def _write_grid(self, data: Dict, out: StringIO) -> None:
         columns = data.get('columns', 3)
-        items = [f'<div class="col">{self.render(item)}</div>' for item in data.get('items', [])]
 
-        return f"""
+        out.write(f"""
         <div class="container my-5">
             <div class="row row-cols-1 row-cols-md-{columns} g-4">
-                {' '.join(items)}
+                """)
+        for i, item in enumerate(data.get('items', [])):
+            if i:
+                out.write(' ')
+            out.write('<div class="col">')
+            self._render_into(item, out)
+            out.write('</div>')
+        out.write("""
             </div>
-        </div>"""
+        </div>""")
 
     def render_alert(self, data: Dict) -> str:
         return f'<div class="alert alert-{data.get("variant", "info")}">{data.get("message", "")}</div>'
@@ -322,10 +415,12 @@ class TailwindRenderer(UIRenderer):
     """Render to Tailwind CSS"""
 
     def render_page(self, data: Dict) -> str:
+        return self._buffered(self._write_page, data)
+
+    def _write_page(self, data: Dict, out: StringIO) -> None:
         title = data.get('title', 'DBBasic')
-        components = self.render(data.get('components', []))
 
-        return f"""<!DOCTYPE html>
+        out.write(f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -334,9 +429,11 @@ class TailwindRenderer(UIRenderer):
     <script src="https://cdn.tailwindcss.com"></script>
 </head>
 <body class="bg-gray-50">
-    {components}
+    """)
+        self._render_into(data.get('components', []), out)
+        out.write("""
 </body>
-</html>"""
+</html>""")
 
     def render_navbar(self, data: Dict) -> str:
         brand = data.get('brand', 'DBBasic')
@@ -384,15 +481,22 @@ class TailwindRenderer(UIRenderer):
         return f'<button class="bg-{color}-500 hover:bg-{color}-600 text-white px-4 py-2 rounded">{data.get("text", "Button")}</button>'
 
     def render_grid(self, data: Dict) -> str:
+        return self._buffered(self._write_grid, data)
+
+    def _write_grid(self, data: Dict, out: StringIO) -> None:
         columns = data.get('columns', 3)
-        items = [self.render(item) for item in data.get('items', [])]
 
-        return f"""
+        out.write(f"""
         <div class="container mx-auto px-4 my-8">
             <div class="grid grid-cols-1 md:grid-cols-{columns} gap-6">
-                {' '.join(items)}
+                """)
+        for i, item in enumerate(data.get('items', [])):
+            if i:
+                out.write(' ')
+            self._render_into(item, out)
+        out.write("""
             </div>
-        </div>"""
+        </div>""")
 
     def render_alert(self, data: Dict) -> str:
         colors = {'info': 'blue', 'success': 'green', 'warning': 'yellow', 'danger': 'red'}
@@ -409,6 +513,100 @@ class TailwindRenderer(UIRenderer):
         </div>"""
 
 
+# ============================================
+# Compiled Templates
+# ============================================
+
+class _FormatValues(dict):
+    """format_map values - unknown fields are written back as {{name}} placeholders"""
+
+    def __missing__(self, key):
+        return '{{' + key + '}}'
+
+
+def _brace_escape(text: str) -> str:
+    return text.replace('{', '{{').replace('}', '}}')
+
+
+class CompiledTemplate:
+    """Static HTML fragments interleaved with named slots"""
+
+    _format = None
+    _encoded = None
+
+    def __init__(self, fragments: List[str], slots: List[Dict]):
+        self.fragments = fragments  # Always one more fragment than slots
+        self.slots = slots
+
+        # (name, rendered default, escape bound values) per slot; defaults are escaped here, once
+        self._bindings = []
+        for slot in slots:
+            default = str(slot.get('default', ''))
+            if slot.get('escape'):
+                default = escape(default)
+            self._bindings.append((slot.get('name'), default, bool(slot.get('escape'))))
+        self._defaults = {name: default for name, default, _ in self._bindings}
+
+    @property
+    def is_static(self) -> bool:
+        return not self.slots
+
+    def render(self, values: Dict[str, Any] = None) -> str:
+        """Fill the slots from values (falling back to each slot's default)"""
+        fragments = self.fragments
+        if not self.slots:
+            return fragments[0]
+
+        values = values or {}
+        parts = [fragments[0]]
+        for (name, default, escaped), fragment in zip(self._bindings, fragments[1:]):
+            if name in values:
+                value = str(values[name])
+                parts.append(escape(value) if escaped else value)
+            else:
+                parts.append(default)
+            parts.append(fragment)
+        return ''.join(parts)
+
+    def render_bytes(self, values: Dict[str, Any] = None) -> bytes:
+        """Like render(), but UTF-8 encoded; the static fragments are encoded only once"""
+        encoded = self._encoded
+        if encoded is None:
+            encoded = self._encoded = [fragment.encode('utf-8') for fragment in self.fragments]
+        if not self.slots:
+            return encoded[0]
+
+        values = values or {}
+        buf = bytearray(encoded[0])
+        for (name, default, escaped), fragment in zip(self._bindings, encoded[1:]):
+            if name in values:
+                value = str(values[name])
+                buf += (escape(value) if escaped else value).encode('utf-8')
+            else:
+                buf += default.encode('utf-8')
+            buf += fragment
+        return bytes(buf)
+
+    def to_format(self) -> str:
+        """This template as a str.format_map string - slots and {{name}} placeholders become fields"""
+        if self._format is None:
+            parts = []
+            for index, fragment in enumerate(self.fragments):
+                pieces = _PLACEHOLDER.split(fragment)
+                parts.append(_brace_escape(pieces[0]))
+                for field, text in zip(pieces[1::2], pieces[2::2]):
+                    parts.append('{' + field + '}')
+                    parts.append(_brace_escape(text))
+                if index < len(self._bindings):
+                    parts.append('{' + str(self._bindings[index][0]) + '}')
+            self._format = ''.join(parts)
+        return self._format
+
+    def format(self, values: Dict[str, Any] = None) -> str:
+        """Fill slots and {{name}} placeholders from values (inserted as-is, not escaped)"""
+        return self.to_format().format_map(_FormatValues(self._defaults, **(values or {})))
+
+
 # ============================================
 # Presentation Manager
 # ============================================
@@ -421,6 +619,16 @@ class PresentationLayer:
         'tailwind': TailwindRenderer(),
     }
 
+    # Long-lived UI structures by name; register_template stores a private copy
+    _templates = {}
+
+    # (template name, framework) -> CompiledTemplate, least recently used first
+    _compiled = OrderedDict()
+    COMPILE_CACHE_SIZE = 256
+
+    # Binds values into compiled templates; None uses CompiledTemplate.render
+    _backend = None
+
     @classmethod
     def initialize_extended(cls):
         """Initialize with extended renderers"""
@@ -444,6 +652,74 @@ class PresentationLayer:
     def add_renderer(name: str, renderer: UIRenderer):
         """Add a custom renderer"""
         PresentationLayer.RENDERERS[name] = renderer
+        PresentationLayer._compiled.clear()
+
+    @classmethod
+    def compile(cls, data: Union[Dict, List, str], framework: str = 'bootstrap') -> CompiledTemplate:
+        """Walk a UI structure once and return its static fragments and slots (not cached)"""
+        renderer = cls.RENDERERS.get(framework)
+        if not renderer:
+            raise ValueError(f"Unknown framework: {framework}. Available: {list(cls.RENDERERS.keys())}")
+
+        renderer._compile_slots = slots = []
+        try:
+            html = renderer.render(data)
+        finally:
+            renderer._compile_slots = None
+
+        # re.split alternates static text with the captured slot indexes
+        parts = _SLOT_SPLIT.split(html)
+        return CompiledTemplate(parts[0::2], [slots[int(i)] for i in parts[1::2]])
+
+    @classmethod
+    def register_template(cls, name: str, data: Union[Dict, List, str]):
+        """Store a UI structure under a name for compile_template and render_compiled
+
+        The structure is copied, so later edits to the caller's tree need another
+        register_template to take effect.
+        """
+        cls._templates[name] = copy.deepcopy(data)
+        for key in [key for key in cls._compiled if key[0] == name]:
+            del cls._compiled[key]
+
+    @classmethod
+    def compile_template(cls, name: str, framework: str = 'bootstrap') -> CompiledTemplate:
+        """Compiled form of a registered template, cached per (name, framework)"""
+        key = (name, framework)
+        compiled = cls._compiled.get(key)
+        if compiled is not None:
+            cls._compiled.move_to_end(key)
+            return compiled
+
+        compiled = cls._compiled[key] = cls.compile(cls._templates[name], framework)
+        if len(cls._compiled) > cls.COMPILE_CACHE_SIZE:
+            cls._compiled.popitem(last=False)
+        return compiled
+
+    @classmethod
+    def set_backend(cls, name: str):
+        """Choose how render_compiled binds values: 'python' (default) or 'minijinja'"""
+        if name == 'python':
+            cls._backend = None
+        elif name == 'minijinja':
+            # Raises ImportError when the minijinja package isn't installed
+            from presentation_layer_minijinja import MiniJinjaBackend
+            cls._backend = MiniJinjaBackend()
+        else:
+            raise ValueError(f"Unknown backend: {name}. Available: ['python', 'minijinja']")
+
+    @classmethod
+    def compile_to_format(cls, data: Union[Dict, List, str], framework: str = 'bootstrap') -> str:
+        """Compile a UI structure to a str.format_map template string"""
+        return cls.compile(data, framework).to_format()
+
+    @classmethod
+    def render_compiled(cls, name: str, framework: str = 'bootstrap', /, **values) -> str:
+        """Render a registered template through its cached compiled form"""
+        compiled = cls.compile_template(name, framework)
+        if cls._backend is not None:
+            return cls._backend.render(compiled, values)
+        return compiled.render(values)
 
 
 # ============================================
@@ -4,52 +4,95 @@ Extended Presentation Layer - Support for IDs, classes, attributes, and scripts
 """
 
 from typing import Dict, List, Any, Optional
-from presentation_layer import UIRenderer
+from functools import lru_cache
+from html import escape
+from io import StringIO
+from presentation_layer import UIRenderer, PresentationLayer
 
-class EnhancedBootstrapRenderer(UIRenderer):
-    """Enhanced Bootstrap renderer with ID, class, and attribute support"""
+# Marks an attribute that isn't set in an _extract_attrs cache key
+_MISSING = object()
 
-    def _extract_attrs(self, data: Dict) -> tuple:
-        """Extract common attributes from data structure"""
-        attrs = []
-
-        # Standard attributes
-        if 'id' in data:
-            attrs.append(f'id="{data["id"]}"')
-
-        # Custom classes (in addition to component defaults)
-        custom_classes = []
-        if 'class' in data:
-            custom_classes.append(data['class'])
-        if 'classes' in data:
-            if isinstance(data['classes'], list):
-                custom_classes.extend(data['classes'])
-            else:
-                custom_classes.append(data['classes'])
+@lru_cache(maxsize=4096)
+def _compile_attrs(key: tuple, types: tuple) -> tuple:
+    """Build the (attributes, custom classes) strings for a frozen attribute set
+
+    types only splits cache entries: 1, 1.0 and True are equal as keys but render differently.
+    """
+    elem_id, css_class, classes, style, data_attrs, custom_attrs, events = key
+    attrs = []
+
+    # Standard attributes
+    if elem_id is not _MISSING:
+        attrs.append(f'id="{escape(str(elem_id))}"')
+
+    # Custom classes (in addition to component defaults)
+    custom_classes = []
+    if css_class is not _MISSING:
+        custom_classes.append(escape(str(css_class)))
+    if isinstance(classes, tuple):
+        custom_classes.extend(escape(str(c)) for c in classes)
+    elif classes is not _MISSING:
+        custom_classes.append(escape(str(classes)))
 
-        # Style attribute
-        if 'style' in data:
-            attrs.append(f'style="{data["style"]}"')
+    # Style attribute
+    if style is not _MISSING:
+        attrs.append(f'style="{escape(str(style))}"')
 
-        # Data attributes (data-*)
-        if 'data' in data:
-            for key, value in data['data'].items():
-                attrs.append(f'data-{key}="{value}"')
+    # Data attributes (data-*)
+    for name, value in data_attrs:
+        attrs.append(f'data-{name}="{escape(str(value))}"')
 
-        # Custom attributes
-        if 'attrs' in data:
-            for key, value in data['attrs'].items():
-                attrs.append(f'{key}="{value}"')
+    # Custom attributes
+    for name, value in custom_attrs:
+        attrs.append(f'{name}="{escape(str(value))}"')
 
-        # Event handlers
-        for key in data:
-            if key.startswith('on'):  # onclick, onchange, etc.
-                attrs.append(f'{key}="{data[key]}"')
+    # Event handlers
+    for name, value in events:
+        attrs.append(f'{name}="{escape(str(value))}"')
 
-        return ' '.join(attrs), ' '.join(custom_classes)
+    return ' '.join(attrs), ' '.join(custom_classes)
+
+
+class EnhancedBootstrapRenderer(UIRenderer):
+    """Enhanced Bootstrap renderer with ID, class, and attribute support"""
+
+    def _extract_attrs(self, data: Dict) -> tuple:
+        """Extract common attributes from data structure"""
+        classes = data.get('classes', _MISSING)
+        if isinstance(classes, list):
+            classes = tuple(classes)
+
+        key = (
+            data.get('id', _MISSING),
+            data.get('class', _MISSING),
+            classes,
+            data.get('style', _MISSING),
+            tuple(data['data'].items()) if 'data' in data else (),
+            tuple(data['attrs'].items()) if 'attrs' in data else (),
+            # Event handlers: onclick, onchange, etc. - kept in the order they appear in data
+            tuple((name, value) for name, value in data.items() if name.startswith('on')),
+        )
+        elem_id, css_class, classes, style, data_attrs, custom_attrs, events = key
+        types = (
+            type(elem_id), type(css_class),
+            tuple(map(type, classes)) if isinstance(classes, tuple) else type(classes),
+            type(style),
+            tuple((type(name), type(value)) for name, value in data_attrs),
+            tuple((type(name), type(value)) for name, value in custom_attrs),
+            tuple(type(value) for _, value in events),
+        )
+
+        try:
+            return _compile_attrs(key, types)
+        except TypeError:
+            # Unhashable attribute values can't be cached
+            return _compile_attrs.__wrapped__(key, types)
 
     def render_div(self, data: Dict) -> str:
         """Render a div with full attribute support"""
+        return self._buffered(self._write_div, data)
+
+    def _write_div(self, data: Dict, out: StringIO) -> None:
         attrs, custom_classes = self._extract_attrs(data)
 
         # Build classes
@@ -61,87 +104,151 @@ class EnhancedBootstrapRenderer(UIRenderer):
         if custom_classes:
             classes.append(custom_classes)
 
-        class_attr = f'class="{" ".join(classes)}"' if classes else ''
+        out.write('<div ')
+        if classes:
+            out.write('class="')
+            _join_into(out, classes)
+            out.write('"')
+        out.write(' ')
+        out.write(attrs)
+        out.write('>')
 
         # Render children
         children = data.get('children', [])
-        content = data.get('content', '')
-
         if children:
-            content = ''.join([self.render(child) for child in children])
-
-        return f'<div {class_attr} {attrs}>{content}</div>'
+            for child in children:
+                self._render_into(child, out)
+        else:
+            out.write(data.get('content', ''))
+        out.write('</div>')
 
     def render_enhanced_card(self, data: Dict) -> str:
         """Card with ID and custom attributes"""
+        return self._buffered(self._write_enhanced_card, data)
+
+    def _write_enhanced_card(self, data: Dict, out: StringIO) -> None:
         attrs, custom_classes = self._extract_attrs(data)
 
-        card_classes = ['card']
+        out.write('\n        <div class="card')
         if custom_classes:
-            card_classes.append(custom_classes)
+            out.write(' ')
+            out.write(custom_classes)
+        out.write('" ')
+        out.write(attrs)
+        out.write('>\n            ')
 
         # Card header
-        header = ''
         if 'header' in data:
             header_id = data.get('header_id', '')
-            header = f'''<div class="card-header" {f'id="{header_id}"' if header_id else ''}>
-                {self.render(data['header'])}
-            </div>'''
+            out.write('<div class="card-header" ')
+            if header_id:
+                out.write('id="')
+                out.write(header_id)
+                out.write('"')
+            out.write('>\n                ')
+            self._render_into(data['header'], out)
+            out.write('\n            </div>')
 
         # Card body
         body_id = data.get('body_id', '')
-        body_attrs = f'id="{body_id}"' if body_id else ''
-
-        return f'''
-        <div class="{' '.join(card_classes)}" {attrs}>
-            {header}
-            <div class="card-body" {body_attrs}>
-                {f'<h5 class="card-title">{data.get("title", "")}</h5>' if 'title' in data else ''}
-                {self.render(data.get('body', data.get('description', '')))}
-            </div>
-            {f'<div class="card-footer">{self.render(data["footer"])}</div>' if 'footer' in data else ''}
-        </div>
-        '''
+        out.write('\n            <div class="card-body" ')
+        if body_id:
+            out.write('id="')
+            out.write(body_id)
+            out.write('"')
+        out.write('>\n                ')
+        if 'title' in data:
+            out.write('<h5 class="card-title">')
+            out.write(data.get('title', ''))
+            out.write('</h5>')
+        out.write('\n                ')
+        self._render_into(data.get('body', data.get('description', '')), out)
+        out.write('\n            </div>\n            ')
+        if 'footer' in data:
+            out.write('<div class="card-footer">')
+            self._render_into(data['footer'], out)
+            out.write('</div>')
+        out.write('\n        </div>\n        ')
 
     def render_span(self, data: Dict) -> str:
         """Render a span with attributes"""
+        return self._buffered(self._write_span, data)
+
+    def _write_span(self, data: Dict, out: StringIO) -> None:
         attrs, custom_classes = self._extract_attrs(data)
-        classes = custom_classes if custom_classes else ''
 
-        return f'<span class="{classes}" {attrs}>{data.get("text", "")}</span>'
+        out.write('<span class="')
+        out.write(custom_classes)
+        out.write('" ')
+        out.write(attrs)
+        out.write('>')
+        out.write(data.get('text', ''))
+        out.write('</span>')
 
     def render_script(self, data: Dict) -> str:
         """Render inline or external script"""
+        return self._buffered(self._write_script, data)
+
+    def _write_script(self, data: Dict, out: StringIO) -> None:
         if 'src' in data:
-            attrs = ' '.join([f'{k}="{v}"' for k, v in data.items() if k != 'type'])
-            return f'<script {attrs}></script>'
+            out.write('<script ')
+            _join_into(out, [f'{k}="{v}"' for k, v in data.items() if k != 'type'])
+            out.write('></script>')
         else:
-            return f'<script>{data.get("content", "")}</script>'
+            out.write('<script>')
+            out.write(data.get('content', ''))
+            out.write('</script>')
 
     def render_style(self, data: Dict) -> str:
         """Render inline styles"""
-        return f'<style>{data.get("content", "")}</style>'
+        return self._buffered(self._write_style, data)
+
+    def _write_style(self, data: Dict, out: StringIO) -> None:
+        out.write('<style>')
+        out.write(data.get('content', ''))
+        out.write('</style>')
+
+    # New enhanced components, keyed by component type
+    _WRITERS = {
+        'div': _write_div,
+        'span': _write_span,
+        'script': _write_script,
+        'style': _write_style,
+        'card': _write_enhanced_card,
+    }
 
     def render(self, data: Any) -> str:
         """Enhanced render with new component types"""
+        out = StringIO()
+        self._render_into(data, out)
+        return out.getvalue()
+
+    def _render_into(self, data: Any, out: StringIO) -> None:
+        """Write enhanced components straight into the shared buffer"""
+        if isinstance(data, str):
+            out.write(data)
+            return
+
+        if isinstance(data, list):
+            for item in data:
+                self._render_into(item, out)
+            return
+
         if isinstance(data, dict):
-            component_type = data.get('type', '')
+            writer = self._WRITERS.get(data.get('type', ''))
+            if writer is not None:
+                return writer(self, data, out)
 
-            # New enhanced components
-            if component_type == 'div':
-                return self.render_div(data)
-            elif component_type == 'span':
-                return self.render_span(data)
-            elif component_type == 'script':
-                return self.render_script(data)
-            elif component_type == 'style':
-                return self.render_style(data)
-            elif component_type == 'card':
-                return self.render_enhanced_card(data)
-            # ... other enhanced components
+        # Fall back to parent implementation, still writing into the same buffer
+        super()._render_into(data, out)
 
-        # Fall back to parent implementation
-        return super().render(data)
+
+def _join_into(out: StringIO, parts: List[str], sep: str = ' ') -> None:
+    """Write parts separated by sep without building the joined string"""
+    for i, part in enumerate(parts):
+        if i:
+            out.write(sep)
+        out.write(part)
 
 
 # Example: Component with IDs and JavaScript
@@ -270,10 +377,26 @@ class ComponentRegistry:
     def register(cls, name: str, component: Dict):
         """Register a reusable component"""
         cls.components[name] = component
+        PresentationLayer.register_template(f'component:{name}', component)
 
     @classmethod
     def get(cls, name: str, **overrides) -> Dict:
-        """Get component with overrides"""
+        """Get component with overrides - a fresh copy the caller may modify"""
+        return cls._build(name, overrides)
+
+    @classmethod
+    def render(cls, name: str, framework: str = 'bootstrap', /, **values) -> str:
+        """Render a registered component, filling its {{placeholders}} from values
+
+        The component is compiled to a format string once per framework, so
+        each call is a single str.format_map.
+        Change a component through register(), which recompiles it.
+        """
+        return PresentationLayer.compile_template(f'component:{name}', framework).format(values)
+
+    @classmethod
+    def _build(cls, name: str, overrides: Dict) -> Dict:
+        """Copy a registered component and apply overrides"""
         component = cls.components.get(name, {}).copy()
 
         # Apply overrides (like ID, custom classes)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+MiniJinja backend - binds compiled templates in Rust via the minijinja package
+
+Enable with PresentationLayer.set_backend('minijinja'). The UI tree is still
+walked once by the Python renderers; each CompiledTemplate is then turned into
+a MiniJinja template, so per-render binding runs outside the interpreter.
+
+Escaped slots use MiniJinja's HTML escaping, which also encodes '/' as &#x2f;.
+"""
+
+import itertools
+import json
+import weakref
+from typing import Any, Dict
+
+import minijinja
+
+from presentation_layer import CompiledTemplate
+
+
+def _literal(text: str) -> str:
+    """Emit static HTML verbatim"""
+    if '{% endraw' in text:
+        return '{{ ' + json.dumps(text, ensure_ascii=False) + ' }}'
+    return '{% raw %}' + text + '{% endraw %}'
+
+
+def _to_jinja(compiled: CompiledTemplate) -> str:
+    """Translate static fragments and slots into MiniJinja template source"""
+    parts = [_literal(compiled.fragments[0])]
+    for (name, default, escaped), fragment in zip(compiled._bindings, compiled.fragments[1:]):
+        key = json.dumps(str(name), ensure_ascii=False)
+        value = f'v[{key}]|e' if escaped else f'v[{key}]'
+        parts.append(f'{{% if {key} in v %}}{{{{ {value} }}}}{{% else %}}{_literal(default)}{{% endif %}}')
+        parts.append(_literal(fragment))
+    return ''.join(parts)
+
+
+class MiniJinjaBackend:
+    """Renders CompiledTemplates through a MiniJinja environment"""
+
+    def __init__(self):
+        self.env = minijinja.Environment()
+        self.env.keep_trailing_newline = True
+        self._names = weakref.WeakKeyDictionary()
+        self._counter = itertools.count()
+
+    def _template_name(self, compiled: CompiledTemplate) -> str:
+        name = self._names.get(compiled)
+        if name is None:
+            name = f'compiled-{next(self._counter)}'
+            self.env.add_template(name, _to_jinja(compiled))
+            self._names[compiled] = name
+            # Drop the template once PresentationLayer lets go of the compiled form
+            weakref.finalize(compiled, self.env.remove_template, name)
+        return name
+
+    def render(self, compiled: CompiledTemplate, values: Dict[str, Any] = None) -> str:
+        """Fill the slots from values (falling back to each slot's default)"""
+        if compiled.is_static:
+            return compiled.fragments[0]
+        return self.env.render_template(self._template_name(compiled), v={k: str(v) for k, v in (values or {}).items()})
@@ -5,21 +5,31 @@ Shows actual service calls, database operations, and system metrics
 """
 
 
-from realtime_monitor_presentation import get_realtime_monitor_ui
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse, JSONResponse
+from realtime_monitor_presentation import get_monitor_html
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
+from fastapi.responses import HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
 import asyncio
-import json
+import gzip
+import hashlib
+from array import array
+import itertools
+import numpy as np
+import orjson
 import random
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, List, Optional, Tuple
 import psutil
 import time
 from collections import deque
 import os
 import sys
 
+try:
+    import brotli
+except ImportError:  # dashboard is then precompressed with gzip only
+    brotli = None
+
 from presentation_layer import PresentationLayer
 from bootstrap_components import ExtendedBootstrapRenderer
 from dbbasic_unified_ui import get_master_layout, SERVICES
@@ -40,10 +50,11 @@ from services.segment_customer import segment_customer
 app = FastAPI(title="DBBasic Realtime Monitor")
 
 # Store for active connections
-active_connections: List[WebSocket] = []
+# Connected clients and their outbound frame queues (drained by one writer task each)
+active_connections: Dict[WebSocket, asyncio.Queue] = {}
 
 # Store for events
-events: List[Dict[str, Any]] = []
+events: deque = deque(maxlen=100)
 
 # Metrics storage
 metrics = {
@@ -52,15 +63,16 @@ metrics = {
     "active_connections": 0,
     "total_operations": 0,
     "service_calls": deque(maxlen=100),  # Last 100 service calls
-    "active_tables": {
-        "customers": 0,
-        "orders": 0,
-        "products": 0,
-        "inventory": 0,
-        "analytics": 0
-    }
 }
 
+# Per-table activity counters, indexed through TABLE_INDEX
+TABLE_NAMES = ("customers", "orders", "products", "inventory", "analytics")
+TABLE_INDEX = {name: index for index, name in enumerate(TABLE_NAMES)}
+table_counts = array('Q', [0] * len(TABLE_NAMES))
+
+# Monotonic times of recent service calls, trimmed to the last second
+recent_call_times: deque = deque()
+
 # Service registry
 services = {
     "calculate_shipping": calculate_shipping,
@@ -71,150 +83,378 @@ services = {
     "segment_customer": segment_customer
 }
 
-async def broadcast_message(message: dict):
-    """Broadcast message to all connected clients"""
-    for connection in active_connections:
+SERVICE_NAMES = tuple(services)
+
+# Keep simulating service calls while no dashboard is connected
+SIMULATE_WHEN_IDLE = False
+
+# Seconds between simulated service calls (the old random 0.1-0.5s sleep averaged 0.3s)
+SIMULATION_INTERVAL = 0.3
+
+# Concurrent simulated service calls
+SIMULATION_WORKERS = 6
+
+# Simulated payloads are drawn from a fixed ring per service
+PAYLOAD_RING_SIZE = 1024
+
+# Tables each service touches (as table_counts indexes), for the simulated activity counters
+TABLE_UPDATES: Dict[str, Tuple[int, ...]] = {
+    service: tuple(TABLE_INDEX[table] for table in tables)
+    for service, tables in {
+        "calculate_shipping": ("orders",),
+        "calculate_discount": ("customers", "orders"),
+        "calculate_order_total": ("orders", "products"),
+        "send_notification": ("customers",),
+        "detect_fraud": ("orders", "customers"),
+        "segment_customer": ("customers", "analytics")
+    }.items()
+}
+
+# Last metrics snapshot broadcast, used to compute metrics_delta frames
+_last_metrics: Dict[str, Any] = {}
+
+# Seconds between disk/network counter reads (rates are averaged over this window)
+IO_COUNTERS_INTERVAL = 5.0
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    """Serialize a message as UTF-8 JSON for a binary WebSocket frame (datetimes as ISO 8601)"""
+    return orjson.dumps(message)
+
+def _snapshot_frame() -> bytes:
+    """Full metrics frame that metrics_delta frames build on"""
+    return _encode({"type": "metrics", "timestamp": datetime.now(), "data": _last_metrics})
+
+def _enqueue(outbox: asyncio.Queue, payload: bytes):
+    """Queue a frame for one client without waiting on its socket"""
+    try:
+        outbox.put_nowait(payload)
+    except asyncio.QueueFull:
+        # The client has fallen behind: drop its backlog and resync it from a full snapshot.
+        # _last_metrics is already current, so a metrics_delta queued after it is a no-op.
+        while not outbox.empty():
+            outbox.get_nowait()
+        if _last_metrics:
+            outbox.put_nowait(_snapshot_frame())
+        outbox.put_nowait(payload)
+
+def _batch_frame(frames: List[bytes]) -> bytes:
+    """Wrap already-encoded frames in one {"type": "batch", "items": [...]} frame without re-encoding"""
+    return b'{"type":"batch","items":[' + b",".join(frames) + b"]}"
+
+async def _writer(websocket: WebSocket, outbox: asyncio.Queue):
+    """Drain one client's outbox onto its socket, coalescing bursts into batch frames"""
+    try:
+        while True:
+            frames = [await outbox.get()]
+            if outbox.empty():
+                # Give a burst a moment to accumulate behind the first frame
+                await asyncio.sleep(BATCH_WINDOW)
+            while not outbox.empty():
+                frames.append(outbox.get_nowait())
+            # Binary frames: orjson's bytes go out as-is, with no per-client text encode
+            await websocket.send_bytes(frames[0] if len(frames) == 1 else _batch_frame(frames))
+    except Exception:
+        # Broken socket; the handler's receive loop sees the disconnect and cleans up
+        active_connections.pop(websocket, None)
+
+# Frames buffered per client before it is considered behind and resynced
+OUTBOX_SIZE = 64
+
+# Seconds a writer waits after a lone frame for more to batch with it
+BATCH_WINDOW = 0.002
+
+# Keep-alive frame sent after 30s of client silence
+PING_FRAME = _encode({"type": "ping"})
+
+# Dashboard structure is static - live data arrives over the WebSocket.
+# Rendered once in startup_event and served as-is
+DASHBOARD_HTML = b""
+DASHBOARD_ETAG = ""
+
+# Precompressed copies of DASHBOARD_HTML: content-coding -> (body, ETag),
+# best first. Compressed once at startup, never per request
+DASHBOARD_ENCODED: Dict[str, Tuple[bytes, str]] = {}
+
+def _dashboard_encoding(accept_encoding: str) -> str:
+    """Best precompressed coding the client accepts, or "" for the plain HTML"""
+    accepted = set()
+    refused = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
         try:
-            await connection.send_json(message)
-        except:
-            pass
+            q = float(params.split("=", 1)[1]) if "=" in params else 1.0
+        except ValueError:
+            q = 1.0
+        # q=0 means "not acceptable", even when "*" would otherwise cover the coding
+        (accepted if q > 0 else refused).add(coding.strip())
+    for coding in DASHBOARD_ENCODED:
+        if coding in accepted or ("*" in accepted and coding not in refused):
+            return coding
+    return ""
+
+async def broadcast_message(message: dict, exclude: Optional[WebSocket] = None):
+    """Broadcast message to all connected clients (except exclude)"""
+    if not active_connections:
+        return
+
+    # Encode once; each client's writer task sends at its own pace
+    payload = _encode(message)
+    for connection, outbox in active_connections.items():
+        if connection is not exclude:
+            _enqueue(outbox, payload)
+
+def _shipping_payloads(rng: np.random.Generator, n: int) -> List[Dict[str, Any]]:
+    weights = rng.uniform(0.5, 20, n).tolist()
+    speeds = rng.choice(["standard", "express", "overnight"], n).tolist()
+    fragile = (rng.random(n) < 0.5).tolist()
+    totals = rng.uniform(10, 500, n).tolist()
+    return [
+        {"weight": w, "shipping_speed": s, "is_fragile": f, "order_total": t}
+        for w, s, f, t in zip(weights, speeds, fragile, totals)
+    ]
+
+def _discount_payloads(rng: np.random.Generator, n: int) -> List[Dict[str, Any]]:
+    tiers = rng.choice(["bronze", "silver", "gold", "platinum"], n).tolist()
+    totals = rng.uniform(50, 1000, n).tolist()
+    counts = rng.integers(1, 11, n).tolist()
+    return [
+        {"customer_tier": tier, "order_total": total, "items_count": count}
+        for tier, total, count in zip(tiers, totals, counts)
+    ]
+
+def _order_total_payloads(rng: np.random.Generator, n: int) -> List[Dict[str, Any]]:
+    # Draw every line item for the whole batch at once, then slice per order
+    item_counts = rng.integers(1, 6, n)
+    offsets = [0] + np.cumsum(item_counts).tolist()
+    prices = rng.uniform(10, 100, offsets[-1]).tolist()
+    quantities = rng.integers(1, 6, offsets[-1]).tolist()
+    states = rng.choice(["CA", "TX", "NY", "FL"], n).tolist()
+    cities = rng.choice(["San Francisco", "Austin", "New York", "Miami"], n).tolist()
+    return [
+        {
+            "items": [{"price": prices[k], "quantity": quantities[k]}
+                      for k in range(offsets[i], offsets[i + 1])],
+            "customer_location": {"state": states[i], "city": cities[i]},
+            "apply_discounts": True
+        }
+        for i in range(n)
+    ]
+
+def _notification_payloads(rng: np.random.Generator, n: int) -> List[Dict[str, Any]]:
+    kinds = rng.choice(["email", "sms", "push"], n).tolist()
+    users = rng.integers(1, 1001, n).tolist()
+    return [
+        {
+            "notification_type": kind,
+            "recipient": {"email": f"user{user}@example.com"},
+            "subject": "Order Update",
+            "message": "Your order status has been updated"
+        }
+        for kind, user in zip(kinds, users)
+    ]
+
+def _fraud_payloads(rng: np.random.Generator, n: int) -> List[Dict[str, Any]]:
+    totals = rng.uniform(50, 5000, n).tolist()
+    ages = rng.integers(0, 366, n).tolist()
+    orders = rng.integers(0, 51, n).tolist()
+    methods = rng.choice(["card", "paypal", "prepaid_card"], n).tolist()
+    return [
+        {
+            "order_data": {"total": total},
+            "customer_data": {"account_age_days": age, "previous_orders": prev},
+            "payment_data": {"method": method}
+        }
+        for total, age, prev, method in zip(totals, ages, orders, methods)
+    ]
+
+def _segment_payloads(rng: np.random.Generator, n: int) -> List[Dict[str, Any]]:
+    ids = rng.integers(1000, 10000, n).tolist()
+    orders = rng.integers(0, 101, n).tolist()
+    values = rng.uniform(0, 10000, n).tolist()
+    recency = rng.integers(0, 366, n).tolist()
+    open_rates = rng.uniform(0, 0.5, n).tolist()
+    usage = rng.integers(0, 31, n).tolist()
+    return [
+        {
+            "customer_id": f"CUST{cid}",
+            "purchase_history": {
+                "total_orders": total_orders,
+                "lifetime_value": value,
+                "days_since_last_order": days
+            },
+            "engagement_metrics": {
+                "email_open_rate": rate,
+                "app_usage_days_per_month": days_used
+            }
+        }
+        for cid, total_orders, value, days, rate, days_used
+        in zip(ids, orders, values, recency, open_rates, usage)
+    ]
+
+# Test data generators, keyed by service name; each builds a batch of n payloads
+PAYLOAD_FACTORIES: Dict[str, Callable[[np.random.Generator, int], List[Dict[str, Any]]]] = {
+    "calculate_shipping": _shipping_payloads,
+    "calculate_discount": _discount_payloads,
+    "calculate_order_total": _order_total_payloads,
+    "send_notification": _notification_payloads,
+    "detect_fraud": _fraud_payloads,
+    "segment_customer": _segment_payloads
+}
 
-async def simulate_service_activity():
-    """Generate realistic service activity"""
+def _build_payload_rings() -> Dict[str, Any]:
+    """Pre-generate a ring of test payloads per service to cycle through"""
+    rng = np.random.default_rng()
+    return {
+        name: itertools.cycle(PAYLOAD_FACTORIES[name](rng, PAYLOAD_RING_SIZE))
+        for name in SERVICE_NAMES
+    }
+
+def _service_picks():
+    """Endless random service names, drawn in batches of 64"""
     while True:
-        try:
-            # Pick a random service
-            service_name = random.choice(list(services.keys()))
-            service_func = services[service_name]
-
-            # Generate appropriate test data for each service
-            if service_name == "calculate_shipping":
-                test_data = {
-                    "weight": random.uniform(0.5, 20),
-                    "shipping_speed": random.choice(["standard", "express", "overnight"]),
-                    "is_fragile": random.choice([True, False]),
-                    "order_total": random.uniform(10, 500)
-                }
-            elif service_name == "calculate_discount":
-                test_data = {
-                    "customer_tier": random.choice(["bronze", "silver", "gold", "platinum"]),
-                    "order_total": random.uniform(50, 1000),
-                    "items_count": random.randint(1, 10)
-                }
-            elif service_name == "calculate_order_total":
-                test_data = {
-                    "items": [{"price": random.uniform(10, 100), "quantity": random.randint(1, 5)}
-                              for _ in range(random.randint(1, 5))],
-                    "customer_location": {
-                        "state": random.choice(["CA", "TX", "NY", "FL"]),
-                        "city": random.choice(["San Francisco", "Austin", "New York", "Miami"])
-                    },
-                    "apply_discounts": True
-                }
-            elif service_name == "send_notification":
-                test_data = {
-                    "notification_type": random.choice(["email", "sms", "push"]),
-                    "recipient": {"email": f"user{random.randint(1,1000)}@example.com"},
-                    "subject": "Order Update",
-                    "message": "Your order status has been updated"
-                }
-            elif service_name == "detect_fraud":
-                test_data = {
-                    "order_data": {"total": random.uniform(50, 5000)},
-                    "customer_data": {
-                        "account_age_days": random.randint(0, 365),
-                        "previous_orders": random.randint(0, 50)
-                    },
-                    "payment_data": {"method": random.choice(["card", "paypal", "prepaid_card"])}
-                }
-            elif service_name == "segment_customer":
-                test_data = {
-                    "customer_id": f"CUST{random.randint(1000, 9999)}",
-                    "purchase_history": {
-                        "total_orders": random.randint(0, 100),
-                        "lifetime_value": random.uniform(0, 10000),
-                        "days_since_last_order": random.randint(0, 365)
-                    },
-                    "engagement_metrics": {
-                        "email_open_rate": random.uniform(0, 0.5),
-                        "app_usage_days_per_month": random.randint(0, 30)
-                    }
-                }
+        yield from random.choices(SERVICE_NAMES, k=64)
 
+async def _simulation_worker(work: asyncio.Queue):
+    """Run queued service calls and publish the results"""
+    while True:
+        service_name, test_data = await work.get()
+        try:
             # Call the actual service
-            start_time = time.time()
-            result = await service_func(test_data)
-            execution_time = (time.time() - start_time) * 1000  # ms
+            start_time = time.perf_counter()
+            result = await services[service_name](test_data)
+            execution_time = (time.perf_counter() - start_time) * 1000  # ms
 
-            # Create activity event
+            # Compact activity event; the dashboard formats time and status itself
             event = {
-                "type": "service_call",
-                "timestamp": datetime.now().isoformat(),
-                "service": service_name,
-                "execution_time_ms": round(execution_time, 3),
-                "success": result.get("success", False),
-                "data_preview": str(result.get("data", {}))[:100] + "..." if result.get("data") else "No data"
+                "type": "sc",
+                "ts": time.time(),
+                "svc": service_name,
+                "ms": round(execution_time, 3),
+                "ok": result.get("success", False)
             }
 
             # Store and broadcast
             metrics["service_calls"].append(event)
             metrics["total_operations"] += 1
+            recent_call_times.append(time.monotonic())
 
             # Update table activity (simulate based on service)
-            table_updates = {
-                "calculate_shipping": ["orders"],
-                "calculate_discount": ["customers", "orders"],
-                "calculate_order_total": ["orders", "products"],
-                "send_notification": ["customers"],
-                "detect_fraud": ["orders", "customers"],
-                "segment_customer": ["customers", "analytics"]
-            }
-
-            for table in table_updates.get(service_name, []):
-                metrics["active_tables"][table] += 1
+            for index in TABLE_UPDATES.get(service_name, ()):
+                table_counts[index] += 1
 
             await broadcast_message(event)
 
         except Exception as e:
             print(f"Error in service activity simulation: {e}")
 
-        await asyncio.sleep(random.uniform(0.1, 0.5))  # Variable rate
+async def simulate_service_activity():
+    """Generate realistic service activity"""
+    payload_iters = _build_payload_rings()
+    service_picks = _service_picks()
+    loop = asyncio.get_running_loop()
+    next_tick = loop.time()
+
+    # Calls run on a worker pool so a slow service doesn't hold up the schedule;
+    # a full queue (every worker busy) pauses the pacer instead of piling up work
+    work = asyncio.Queue(maxsize=SIMULATION_WORKERS)
+    workers = [asyncio.create_task(_simulation_worker(work)) for _ in range(SIMULATION_WORKERS)]
+
+    try:
+        while True:
+            if not active_connections and not SIMULATE_WHEN_IDLE:
+                await asyncio.sleep(0.5)
+                next_tick = loop.time()
+                continue
+
+            # Pick a random service
+            service_name = next(service_picks)
+            await work.put((service_name, next(payload_iters[service_name])))
+
+            # Fixed cadence; if the pool fell behind, restart the schedule rather than bursting to catch up
+            next_tick += SIMULATION_INTERVAL
+            delay = next_tick - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                next_tick = loop.time()
+                await asyncio.sleep(0)
+    finally:
+        for worker in workers:
+            worker.cancel()
+
+def _io_rates(previous: Optional[tuple], current: Optional[tuple]) -> Dict[str, float]:
+    """Disk and network MB/s between two (time, disk counters, net counters) reads"""
+    rates = dict.fromkeys(("disk_read_mb_per_sec", "disk_write_mb_per_sec",
+                           "network_sent_mb_per_sec", "network_recv_mb_per_sec"), 0.0)
+    if previous is None or current is None:
+        return rates
+
+    (t0, disk0, net0), (t1, disk1, net1) = previous, current
+    scale = (1024**2) * (t1 - t0)
+    # psutil returns None for counters the platform can't provide
+    if disk0 and disk1:
+        rates["disk_read_mb_per_sec"] = round((disk1.read_bytes - disk0.read_bytes) / scale, 2)
+        rates["disk_write_mb_per_sec"] = round((disk1.write_bytes - disk0.write_bytes) / scale, 2)
+    if net0 and net1:
+        rates["network_sent_mb_per_sec"] = round((net1.bytes_sent - net0.bytes_sent) / scale, 2)
+        rates["network_recv_mb_per_sec"] = round((net1.bytes_recv - net0.bytes_recv) / scale, 2)
+    return rates
 
 async def calculate_metrics():
     """Calculate and broadcast system metrics"""
+    global _last_metrics
+    io_counters = None  # (monotonic time, disk counters, net counters) at the last read
+    io_rates = _io_rates(None, None)
+
     while True:
+        if not active_connections:
+            # Nobody is watching; don't let the ops window grow unread
+            recent_call_times.clear()
+            await asyncio.sleep(1)
+            continue
+
         try:
-            # Get system metrics
-            cpu_percent = psutil.cpu_percent(interval=0.1)
+            # Get system metrics (cpu_percent was primed in startup_event)
+            cpu_percent = psutil.cpu_percent(interval=None)
             memory = psutil.virtual_memory()
-            disk_io = psutil.disk_io_counters()
-            net_io = psutil.net_io_counters()
 
-            # Calculate operations per second
-            current_ops = len(metrics["service_calls"])
+            # I/O counters are cumulative; turn them into rates on a slower cadence
+            now = time.monotonic()
+            if io_counters is None or now - io_counters[0] >= IO_COUNTERS_INTERVAL:
+                current = (now, psutil.disk_io_counters(), psutil.net_io_counters())
+                io_rates = _io_rates(io_counters, current)
+                io_counters = current
+
+            # Calculate operations per second over a sliding one-second window
+            cutoff = now - 1.0
+            while recent_call_times and recent_call_times[0] < cutoff:
+                recent_call_times.popleft()
+            current_ops = len(recent_call_times)
             metrics["operations_per_second"].append(current_ops)
 
-            # Prepare metrics message
-            metrics_msg = {
-                "type": "metrics",
-                "timestamp": datetime.now().isoformat(),
-                "data": {
-                    "operations_per_second": current_ops * 10,  # Multiply for display
-                    "rows_per_second": metrics["rows_per_second"],
-                    "active_connections": len(active_connections),
-                    "total_operations": metrics["total_operations"],
-                    "cpu_percent": cpu_percent,
-                    "memory_used_gb": round(memory.used / (1024**3), 2),
-                    "memory_total_gb": round(memory.total / (1024**3), 2),
-                    "disk_read_mb": round(disk_io.read_bytes / (1024**2), 2),
-                    "disk_write_mb": round(disk_io.write_bytes / (1024**2), 2),
-                    "network_sent_mb": round(net_io.bytes_sent / (1024**2), 2),
-                    "network_recv_mb": round(net_io.bytes_recv / (1024**2), 2),
-                    "active_tables": metrics["active_tables"]
-                }
+            # Current metrics snapshot
+            snapshot = {
+                "operations_per_second": current_ops,
+                "rows_per_second": metrics["rows_per_second"],
+                "active_connections": len(active_connections),
+                "total_operations": metrics["total_operations"],
+                "cpu_percent": cpu_percent,
+                "memory_used_gb": round(memory.used / (1024**3), 2),
+                "memory_total_gb": round(memory.total / (1024**3), 2),
+                **io_rates,
+                "active_tables": dict(zip(TABLE_NAMES, table_counts))
             }
 
-            await broadcast_message(metrics_msg)
+            # Clients hold the last full snapshot, so only send what changed
+            delta = {k: v for k, v in snapshot.items() if _last_metrics.get(k) != v}
+            _last_metrics = snapshot
+
+            if delta:
+                await broadcast_message({
+                    "type": "metrics_delta",
+                    "timestamp": datetime.now(),
+                    "data": delta
+                })
 
         except Exception as e:
             print(f"Error calculating metrics: {e}")
@@ -223,7 +463,18 @@ async def calculate_metrics():
 
 @app.on_event("startup")
 async def startup_event():
-    """Start background tasks"""
+    """Render the dashboard and start background tasks"""
+    global DASHBOARD_HTML, DASHBOARD_ETAG
+    # Prime psutil so later non-blocking cpu_percent() calls return a delta
+    psutil.cpu_percent(interval=None)
+
+    DASHBOARD_HTML = get_monitor_html().encode('utf-8')
+    digest = hashlib.blake2b(DASHBOARD_HTML).hexdigest()[:16]
+    DASHBOARD_ETAG = f'"{digest}"'
+    if brotli is not None:
+        DASHBOARD_ENCODED["br"] = (brotli.compress(DASHBOARD_HTML, quality=11), f'"{digest}-br"')
+    DASHBOARD_ENCODED["gzip"] = (gzip.compress(DASHBOARD_HTML, compresslevel=9), f'"{digest}-gzip"')
+
     asyncio.create_task(simulate_service_activity())
     asyncio.create_task(calculate_metrics())
 
@@ -231,79 +482,92 @@ async def startup_event():
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time updates"""
     await websocket.accept()
-    active_connections.append(websocket)
 
-    try:
-        # Send initial data
-        await websocket.send_json({
-            "type": "connection",
-            "status": "connected",
-            "timestamp": datetime.now().isoformat()
-        })
+    # Greeting and full metrics snapshot go first; metrics_delta frames build on it
+    outbox = asyncio.Queue(maxsize=OUTBOX_SIZE)
+    outbox.put_nowait(_encode({
+        "type": "connection",
+        "status": "connected",
+        "timestamp": datetime.now()
+    }))
+    if _last_metrics:
+        outbox.put_nowait(_snapshot_frame())
 
+    active_connections[websocket] = outbox
+    writer = asyncio.create_task(_writer(websocket, outbox))
+
+    try:
         # Keep connection alive and handle incoming events
         while True:
             try:
-                # Wait for incoming data with timeout
-                data = await asyncio.wait_for(websocket.receive_text(), timeout=30.0)
+                # Wait for incoming data with timeout; text and binary frames
+                # are both handed to orjson as-is, no decode step
+                message = await asyncio.wait_for(websocket.receive(), timeout=30.0)
+                if message["type"] == "websocket.disconnect":
+                    break
+                data = message.get("bytes") or message.get("text") or ""
                 print(f"Received event: {data[:100]}...")
 
                 # Parse incoming event data
                 try:
-                    event_data = json.loads(data)
+                    event_data = orjson.loads(data)
 
-                    # Store event for display (keep last 100 events)
+                    # Store event for display (the deque keeps the last 100)
                     events.append(event_data)
-                    if len(events) > 100:
-                        events.pop(0)
 
                     # Broadcast to all browser connections (excluding sender)
-                    for connection in active_connections[:]:
-                        if connection != websocket:  # Don't send back to sender
-                            try:
-                                await connection.send_json(event_data)
-                            except:
-                                # Remove broken connections
-                                if connection in active_connections:
-                                    active_connections.remove(connection)
-
-                except json.JSONDecodeError:
+                    await broadcast_message(event_data, exclude=websocket)
+
+                except orjson.JSONDecodeError:
                     print(f"Invalid JSON received: {data}")
 
             except asyncio.TimeoutError:
-                # Send ping to keep connection alive
-                try:
-                    await websocket.send_json({"type": "ping"})
-                except:
-                    # Connection is broken
+                # Send ping to keep connection alive; a dead socket ends the writer
+                if writer.done():
                     break
+                _enqueue(outbox, PING_FRAME)
 
     except WebSocketDisconnect:
         print("connection closed")
-        if websocket in active_connections:
-            active_connections.remove(websocket)
+    finally:
+        # However the loop ended, stop broadcasting to this socket
+        active_connections.pop(websocket, None)
+        writer.cancel()
 
 @app.get("/")
-async def dashboard():
-    """Serve real-time monitor dashboard using presentation layer"""
-    from realtime_monitor_presentation import get_realtime_monitor_ui
-
-    ui_data = get_realtime_monitor_ui()
-    html_content = PresentationLayer.render(ui_data, 'bootstrap')
-    return HTMLResponse(content=html_content)
+async def dashboard(request: Request):
+    """Serve the pre-rendered real-time monitor dashboard, precompressed when the client allows"""
+    encoding = _dashboard_encoding(request.headers.get("accept-encoding", ""))
+    body, etag = DASHBOARD_ENCODED[encoding] if encoding else (DASHBOARD_HTML, DASHBOARD_ETAG)
+    headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return HTMLResponse(content=body, headers=headers)
 
 @app.get("/api/metrics")
 async def get_metrics():
     """Get current metrics as JSON"""
-    return JSONResponse({
-        "operations_per_second": len(metrics["operations_per_second"]),
+    return Response(orjson.dumps({
+        "operations_per_second": metrics["operations_per_second"][-1] if metrics["operations_per_second"] else 0,
         "rows_per_second": metrics["rows_per_second"],
         "active_connections": len(active_connections),
         "total_operations": metrics["total_operations"],
         "recent_calls": list(metrics["service_calls"])[-10:],
-        "active_tables": metrics["active_tables"]
-    })
+        "active_tables": dict(zip(TABLE_NAMES, table_counts))
+    }), media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8004)
\ No newline at end of file
+
+    # libuv event loop for the broadcast/simulation tasks (ships with uvicorn[standard], not on Windows)
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+
+    # Frames are encoded once in broadcast_message; permessage-deflate compresses them on the wire
+    uvicorn.run(app, host="0.0.0.0", port=8004, loop=loop, ws="websockets", ws_per_message_deflate=True)
\ No newline at end of file
@@ -4,12 +4,15 @@ DBBasic Real-time Monitor - On-Demand Mode
 Only processes services when there are actual requests, not continuous simulation
 """
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 import asyncio
-import json
+import hashlib
+import itertools
+import numpy as np
+import orjson
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set
 import psutil
 import time
 from collections import deque
@@ -20,15 +23,67 @@ import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from services.calculate_shipping import calculate_shipping
 from services.calculate_discount import calculate_discount
-from services.calculate_order_total import calculate_order_total
+from services.calculate_order_total import calculate_order_total, calculate_order_total_batch
 from services.send_notification import send_notification
 from services.detect_fraud import detect_fraud
-from services.segment_customer import segment_customer
+from services.segment_customer import segment_customer, segment_customer_batch
 
-app = FastAPI(title="DBBasic Realtime Monitor - On Demand")
+class OrjsonResponse(JSONResponse):
+    """JSONResponse rendered by orjson (datetimes and non-str keys handled natively)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+app = FastAPI(title="DBBasic Realtime Monitor - On Demand", default_response_class=OrjsonResponse)
 
 # Store for active connections
-active_connections: List[WebSocket] = []
+active_connections: Set[WebSocket] = set()
+
+class CallHistory:
+    """Fixed-size ring of recent service calls, one NumPy column per field"""
+
+    def __init__(self, capacity: int, service_names):
+        self.capacity = capacity
+        self.service_names = tuple(service_names)
+        self.service_ids = {name: i for i, name in enumerate(self.service_names)}
+        self.ts_ns = np.zeros(capacity, np.int64)
+        self.exec_us = np.zeros(capacity, np.int32)
+        self.svc = np.zeros(capacity, np.int8)
+        self.ok = np.zeros(capacity, np.uint8)
+        self.data: List[Any] = [None] * capacity  # result payloads stay Python objects
+        self.head = 0
+        self.count = 0
+
+    def append(self, ts_ns: int, service_name: str, exec_us: int, success: bool, data: Any):
+        i = self.head
+        self.ts_ns[i] = ts_ns
+        self.exec_us[i] = exec_us
+        self.svc[i] = self.service_ids[service_name]
+        self.ok[i] = success
+        self.data[i] = data
+        self.head = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def __len__(self):
+        return self.count
+
+    def recent(self, n: int) -> List[Dict[str, Any]]:
+        """Materialize the newest n calls (oldest first) as event dicts"""
+        n = min(n, self.count)
+        idx = (self.head - n + np.arange(n)) % self.capacity
+        return [
+            {
+                "type": "service_call",
+                "ts": ts / 1e9,
+                "service": self.service_names[svc],
+                "execution_time_ms": us / 1000,
+                "success": bool(ok),
+                "data": self.data[i],
+                "mode": "on-demand"
+            }
+            for i, ts, svc, us, ok in zip(idx.tolist(), self.ts_ns[idx].tolist(), self.svc[idx].tolist(),
+                                          self.exec_us[idx].tolist(), self.ok[idx].tolist())
+        ]
 
 # Metrics storage
 metrics = {
@@ -36,11 +91,15 @@ metrics = {
     "rows_per_second": 402000000,  # Our benchmark
     "active_connections": 0,
     "total_operations": 0,
-    "service_calls": deque(maxlen=100),
+    "service_calls": None,  # CallHistory, created once the registry below exists
     "last_activity": None,
     "mode": "on-demand"  # vs "continuous"
 }
 
+# Completion times (epoch seconds) of calls in the last minute, oldest first
+_ops_timestamps: deque = deque()
+OPS_WINDOW = 60
+
 # Service registry
 services = {
     "calculate_shipping": calculate_shipping,
@@ -50,14 +109,162 @@ services = {
     "detect_fraud": detect_fraud,
     "segment_customer": segment_customer
 }
+metrics["service_calls"] = CallHistory(100, services)
+
+# Micro-batching for /api/service/{name}: calls arriving within MICROBATCH_WINDOW
+# seconds (up to MICROBATCH_MAX) are dispatched together. Only services listed
+# here batch; those with an entry in batch_services run it in bulk.
+MICROBATCH_SERVICES: frozenset = frozenset()
+# Bulk entry points (list of payloads -> list of results) for micro-batched services
+batch_services = {
+    "calculate_order_total": calculate_order_total_batch,
+    "segment_customer": segment_customer_batch
+}
+MICROBATCH_MAX = 32
+MICROBATCH_WINDOW = 0.002
+
+class MicroBatcher:
+    """Collects single calls to one service and runs them as a batch"""
+
+    def __init__(self, func, batch_func=None):
+        self.func = func
+        self.batch_func = batch_func
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+
+    async def submit(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if self.task is None or self.task.done():
+            self.queue = asyncio.Queue()
+            self.task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((payload, future))
+        return await future
+
+    async def _collect(self) -> list:
+        batch = [await self.queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + MICROBATCH_WINDOW
+        while len(batch) < MICROBATCH_MAX:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            payloads = [payload for payload, _ in batch]
+            try:
+                if len(batch) == 1:  # lone call - skip the batch path's setup
+                    results = await asyncio.gather(self.func(payloads[0]), return_exceptions=True)
+                elif self.batch_func is not None:
+                    results = self.batch_func(payloads)
+                else:
+                    results = await asyncio.gather(*(self.func(p) for p in payloads), return_exceptions=True)
+            except Exception as e:
+                results = [e] * len(batch)
+            for (_, future), result in zip(batch, results):
+                if future.done():  # caller went away
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+_batchers: Dict[str, MicroBatcher] = {}
+
+def _dispatch(service_name: str, service_func):
+    """Pick direct invocation or the service's micro-batcher"""
+    if service_name in MICROBATCH_SERVICES:
+        batcher = _batchers.get(service_name)
+        if batcher is None:
+            batcher = _batchers[service_name] = MicroBatcher(service_func, batch_services.get(service_name))
+        return batcher.submit
+    return service_func
+
+PREVIEW_CHARS = 100
+PREVIEW_KEYS = 4  # a dict preview never needs more than its first few entries
+
+def _preview(data: Any) -> str:
+    """Short JSON preview of a result payload, without encoding all of a large one"""
+    if not data:
+        return "No data"
+    truncated = False
+    if isinstance(data, dict) and len(data) > PREVIEW_KEYS:
+        data = dict(itertools.islice(data.items(), PREVIEW_KEYS))
+        truncated = True
+    text = orjson.dumps(data, default=str).decode()
+    if truncated or len(text) > PREVIEW_CHARS:
+        return text[:PREVIEW_CHARS] + "..."
+    return text
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    """Format an epoch timestamp for the wire"""
+    return datetime.fromtimestamp(ts).isoformat() if ts is not None else None
+
+# [second, formatted] of the last whole-second timestamp produced
+_second_cache: list = [None, None]
+
+def _iso_second(ts: Optional[float] = None) -> Optional[str]:
+    """Whole-second ISO timestamp, formatted at most once per second (ts defaults to now)"""
+    if ts is None:
+        ts = time.time()
+    second = int(ts)
+    cache = _second_cache
+    if cache[0] != second:
+        cache[0] = second
+        cache[1] = datetime.fromtimestamp(second).isoformat()
+    return cache[1]
+
+# Clients that cannot take a frame within this many seconds are disconnected
+SEND_TIMEOUT = 0.5
+
+async def _send_frame(connection: WebSocket, frame: bytes):
+    await asyncio.wait_for(connection.send_bytes(frame), SEND_TIMEOUT)
+
+async def _drop_client(connection: WebSocket):
+    """Close a client that fell behind; its stream may hold a half-sent frame"""
+    try:
+        await asyncio.wait_for(connection.close(code=1013), SEND_TIMEOUT)
+    except Exception:
+        pass
 
 async def broadcast_message(message: dict):
-    """Broadcast message to all connected clients"""
-    for connection in active_connections:
-        try:
-            await connection.send_json(message)
-        except:
-            pass
+    """Broadcast message to all connected clients concurrently"""
+    if not active_connections:
+        return
+    # Serialize once; every socket gets the same UTF-8 JSON binary frame
+    frame = orjson.dumps(message, default=str, option=orjson.OPT_NON_STR_KEYS)
+    connections = tuple(active_connections)
+    results = await asyncio.gather(
+        *(_send_frame(connection, frame) for connection in connections),
+        return_exceptions=True
+    )
+    dead = [c for c, r in zip(connections, results) if isinstance(r, Exception)]
+    if dead:
+        active_connections.difference_update(dead)
+        await asyncio.gather(*(_drop_client(c) for c in dead))
+
+# Reusable service_call message. broadcast_message encodes it before its first
+# await, so refilling it on the next call cannot race an earlier send.
+_service_call_event: Dict[str, Any] = {
+    "type": "service_call",
+    "ts": None,
+    "timestamp": None,
+    "service": None,
+    "execution_time_ms": None,
+    "success": None,
+    "data": None,
+    "mode": "on-demand",
+    "data_preview": None
+}
 
 @app.post("/api/service/{service_name}")
 async def call_service_endpoint(service_name: str, payload: Dict[str, Any]):
@@ -65,50 +272,53 @@ async def call_service_endpoint(service_name: str, payload: Dict[str, Any]):
     Call a service on-demand via API endpoint.
     This is the main difference - services only run when explicitly called!
     """
-    if service_name not in services:
+    service_func = services.get(service_name)
+    if service_func is None:
         raise HTTPException(status_code=404, detail=f"Service '{service_name}' not found")
 
     try:
-        # Record start time
-        start_time = time.time()
+        # Record start time (monotonic, high resolution)
+        start = time.perf_counter()
 
         # Call the actual service
-        service_func = services[service_name]
-        result = await service_func(payload)
+        result = await _dispatch(service_name, service_func)(payload)
 
         # Calculate execution time
-        execution_time = (time.time() - start_time) * 1000  # ms
-
-        # Create activity event
-        event = {
-            "type": "service_call",
-            "timestamp": datetime.now().isoformat(),
-            "service": service_name,
-            "execution_time_ms": round(execution_time, 3),
-            "success": result.get("success", False),
-            "data": result.get("data", {}),
-            "mode": "on-demand"
-        }
-
-        # Store metrics
-        metrics["service_calls"].append(event)
+        exec_us = int((time.perf_counter() - start) * 1_000_000)
+        execution_ms = exec_us / 1000
+        success = result.get("success", False)
+        data = result.get("data") or {}
+
+        # Record the call (epoch seconds; formatted only for the wire)
+        now_ns = time.time_ns()
+        now = now_ns / 1e9
+        metrics["service_calls"].append(now_ns, service_name, exec_us, success, data)
         metrics["total_operations"] += 1
-        metrics["last_activity"] = datetime.now().isoformat()
-
-        # Broadcast to connected clients
-        await broadcast_message({
-            **event,
-            "data_preview": str(result.get("data", {}))[:100] + "..." if result.get("data") else "No data"
-        })
-
-        return JSONResponse(content={
+        metrics["last_activity"] = now
+        _ops_timestamps.append(now)
+        _metrics_dirty.set()
+
+        # Broadcast to connected clients; with nobody listening the event is never built
+        if active_connections:
+            event = _service_call_event
+            event["ts"] = now
+            event["timestamp"] = _iso(now)
+            event["service"] = service_name
+            event["execution_time_ms"] = execution_ms
+            event["success"] = success
+            event["data"] = data
+            event["data_preview"] = _preview(data)
+            await broadcast_message(event)
+            event["data"] = None  # don't pin the last payload
+
+        return OrjsonResponse(content={
             "success": True,
-            "execution_time_ms": round(execution_time, 3),
+            "execution_time_ms": execution_ms,
             "result": result
         })
 
     except Exception as e:
-        return JSONResponse(
+        return OrjsonResponse(
             status_code=500,
             content={
                 "success": False,
@@ -116,78 +326,112 @@ async def call_service_endpoint(service_name: str, payload: Dict[str, Any]):
             }
         )
 
+# Upper bound on service calls a single batch runs at once
+BATCH_CONCURRENCY = 32
+
+async def _run_batch_item(service_name: str, payload: Dict[str, Any], limit: asyncio.Semaphore) -> Dict[str, Any]:
+    """Run one batch entry, capturing its timing or error"""
+    async with limit:
+        try:
+            start = time.perf_counter()
+            result = await services[service_name](payload)
+            exec_us = int((time.perf_counter() - start) * 1_000_000)
+        except Exception as e:
+            return {
+                "service": service_name,
+                "success": False,
+                "error": str(e)
+            }
+
+    # Update metrics
+    metrics["total_operations"] += 1
+    _ops_timestamps.append(time.time())
+
+    return {
+        "service": service_name,
+        "success": True,
+        "execution_time_ms": exec_us / 1000,
+        "result": result
+    }
+
 @app.post("/api/batch")
 async def batch_process(requests: List[Dict[str, Any]]):
     """
     Process multiple service requests in batch.
     Useful for testing or bulk operations.
+    Entries run concurrently (up to BATCH_CONCURRENCY at a time); results keep request order.
     """
-    results = []
-
-    for request in requests:
-        service_name = request.get("service")
-        payload = request.get("payload", {})
+    limit = asyncio.Semaphore(BATCH_CONCURRENCY)
+    results = await asyncio.gather(*(
+        _run_batch_item(request.get("service"), request.get("payload", {}), limit)
+        for request in requests
+        if request.get("service") in services
+    ))
 
-        if service_name in services:
-            try:
-                start_time = time.time()
-                result = await services[service_name](payload)
-                execution_time = (time.time() - start_time) * 1000
-
-                results.append({
-                    "service": service_name,
-                    "success": True,
-                    "execution_time_ms": round(execution_time, 3),
-                    "result": result
-                })
-
-                # Update metrics
-                metrics["total_operations"] += 1
-
-            except Exception as e:
-                results.append({
-                    "service": service_name,
-                    "success": False,
-                    "error": str(e)
-                })
-
-    metrics["last_activity"] = datetime.now().isoformat()
+    now = time.time()
+    metrics["last_activity"] = now
+    _metrics_dirty.set()
 
     # Broadcast summary
     await broadcast_message({
         "type": "batch_complete",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _iso_second(now),
         "total_requests": len(requests),
         "successful": sum(1 for r in results if r.get("success")),
         "failed": sum(1 for r in results if not r.get("success"))
     })
 
-    return JSONResponse(content={
+    return OrjsonResponse(content={
         "batch_size": len(requests),
         "results": results
     })
 
+# Fingerprint of the last metrics broadcast; reset when a client connects
+_last_metrics_key: Optional[tuple] = None
+
+# Set by service calls and new clients; the metrics task otherwise wakes every heartbeat
+_metrics_dirty = asyncio.Event()
+METRICS_HEARTBEAT = 5.0
+METRICS_DEBOUNCE = 0.1
+
 async def calculate_metrics():
-    """Calculate and broadcast system metrics periodically"""
+    """Broadcast system metrics after activity, or every heartbeat while clients are connected"""
+    global _last_metrics_key
     while True:
         try:
-            # Get system metrics
-            cpu_percent = psutil.cpu_percent(interval=0.1)
+            await asyncio.wait_for(_metrics_dirty.wait(), timeout=METRICS_HEARTBEAT)
+            # Let a burst of calls settle into a single update
+            await asyncio.sleep(METRICS_DEBOUNCE)
+        except asyncio.TimeoutError:
+            pass
+        _metrics_dirty.clear()
+
+        # Nobody is watching - skip the psutil reads and message build
+        if not active_connections:
+            continue
+
+        try:
+            # Get system metrics (non-blocking: usage since the previous tick)
+            cpu_percent = psutil.cpu_percent(interval=None)
             memory = psutil.virtual_memory()
 
             # Calculate operations per second (based on last minute)
-            now = datetime.now()
-            recent_ops = [
-                op for op in metrics["service_calls"]
-                if op.get("timestamp") and
-                (now - datetime.fromisoformat(op["timestamp"])).seconds < 60
-            ]
-            ops_per_sec = len(recent_ops) / 60 if recent_ops else 0
+            now = time.time()
+            cutoff = now - OPS_WINDOW
+            while _ops_timestamps and _ops_timestamps[0] < cutoff:
+                _ops_timestamps.popleft()
+            ops_per_sec = len(_ops_timestamps) / OPS_WINDOW
+
+            # Suppress the broadcast when nothing visible has changed
+            key = (round(ops_per_sec, 2), metrics["total_operations"], int(cpu_percent), metrics["last_activity"])
+            if key == _last_metrics_key:
+                continue
+            _last_metrics_key = key
 
             # Prepare metrics message
             metrics_msg = {
                 "type": "metrics",
-                "timestamp": now.isoformat(),
+                "timestamp": _iso_second(now),
                 "data": {
                     "operations_per_second": round(ops_per_sec, 2),
                     "rows_per_second": metrics["rows_per_second"],
@@ -197,7 +441,7 @@ async def calculate_metrics():
                     "memory_used_gb": round(memory.used / (1024**3), 2),
                     "memory_total_gb": round(memory.total / (1024**3), 2),
                     "mode": metrics["mode"],
-                    "last_activity": metrics["last_activity"]
+                    "last_activity": _iso_second(metrics["last_activity"]) if metrics["last_activity"] else None
                 }
             }
 
@@ -206,38 +450,44 @@ async def calculate_metrics():
         except Exception as e:
             print(f"Error calculating metrics: {e}")
 
-        await asyncio.sleep(1)
-
 @app.on_event("startup")
 async def startup_event():
     """Start background tasks"""
+    psutil.cpu_percent(interval=None)  # prime the counter for the first tick
     asyncio.create_task(calculate_metrics())
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time updates"""
+    global _last_metrics_key
     await websocket.accept()
-    active_connections.append(websocket)
+    active_connections.add(websocket)
+    _last_metrics_key = None  # make sure the newcomer gets a full update
+    _metrics_dirty.set()
 
     try:
-        await websocket.send_json({
+        await websocket.send_bytes(orjson.dumps({
             "type": "connection",
             "status": "connected",
             "mode": "on-demand",
-            "timestamp": datetime.now().isoformat()
-        })
+            "timestamp": _iso_second()
+        }))
 
+        # The stream is outbound only; client frames are discarded undecoded
+        # and the loop just waits for the close
         while True:
-            data = await websocket.receive_text()
-            # Handle any commands from client if needed
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
 
     except WebSocketDisconnect:
-        active_connections.remove(websocket)
+        pass
+    finally:
+        # A failed broadcast may already have pruned this socket
+        active_connections.discard(websocket)
 
-@app.get("/")
-async def root():
-    """Serve the real-time monitor interface"""
-    html_content = """
+# Monitor interface - encoded once at import, served as-is
+MONITOR_HTML = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -478,6 +728,8 @@ async def root():
 
     <script>
         const ws = new WebSocket('ws://localhost:8005/ws');
+        ws.binaryType = 'arraybuffer';  // broadcasts arrive as binary UTF-8 JSON
+        const frameDecoder = new TextDecoder();
         const streamContent = document.getElementById('stream-content');
         const services = ['calculate_shipping', 'calculate_discount', 'calculate_order_total',
                          'send_notification', 'detect_fraud', 'segment_customer'];
@@ -488,7 +740,8 @@ async def root():
         };
 
         ws.onmessage = (event) => {
-            const data = JSON.parse(event.data);
+            const data = JSON.parse(
+                typeof event.data === 'string' ? event.data : frameDecoder.decode(event.data));
 
             if (data.type === 'service_call') {
                 // Clear idle message on first real activity
@@ -570,74 +823,85 @@ async def root():
             console.log('Batch result:', result);
         }
 
-        function generateTestPayload(service) {
-            // Generate appropriate test data for each service
-            const payloads = {
-                calculate_shipping: {
-                    weight: Math.random() * 20,
-                    shipping_speed: ['standard', 'express', 'overnight'][Math.floor(Math.random() * 3)],
-                    is_fragile: Math.random() > 0.5,
-                    order_total: Math.random() * 500
-                },
-                calculate_discount: {
-                    customer_tier: ['bronze', 'silver', 'gold', 'platinum'][Math.floor(Math.random() * 4)],
-                    order_total: Math.random() * 1000,
-                    items_count: Math.floor(Math.random() * 10) + 1
-                },
-                calculate_order_total: {
-                    items: Array(Math.floor(Math.random() * 5) + 1).fill(0).map(() => ({
-                        price: Math.random() * 100,
-                        quantity: Math.floor(Math.random() * 5) + 1
-                    })),
-                    customer_location: {
-                        state: ['CA', 'TX', 'NY', 'FL'][Math.floor(Math.random() * 4)],
-                        city: ['San Francisco', 'Austin', 'New York', 'Miami'][Math.floor(Math.random() * 4)]
-                    }
-                },
-                send_notification: {
-                    notification_type: ['email', 'sms', 'push'][Math.floor(Math.random() * 3)],
-                    recipient: { email: 'user@example.com' },
-                    subject: 'Test Notification',
-                    message: 'Test message content'
+        // Test data generators, keyed by service - only the requested one runs
+        const payloadGenerators = {
+            calculate_shipping: () => ({
+                weight: Math.random() * 20,
+                shipping_speed: ['standard', 'express', 'overnight'][Math.floor(Math.random() * 3)],
+                is_fragile: Math.random() > 0.5,
+                order_total: Math.random() * 500
+            }),
+            calculate_discount: () => ({
+                customer_tier: ['bronze', 'silver', 'gold', 'platinum'][Math.floor(Math.random() * 4)],
+                order_total: Math.random() * 1000,
+                items_count: Math.floor(Math.random() * 10) + 1
+            }),
+            calculate_order_total: () => ({
+                items: Array(Math.floor(Math.random() * 5) + 1).fill(0).map(() => ({
+                    price: Math.random() * 100,
+                    quantity: Math.floor(Math.random() * 5) + 1
+                })),
+                customer_location: {
+                    state: ['CA', 'TX', 'NY', 'FL'][Math.floor(Math.random() * 4)],
+                    city: ['San Francisco', 'Austin', 'New York', 'Miami'][Math.floor(Math.random() * 4)]
+                }
+            }),
+            send_notification: () => ({
+                notification_type: ['email', 'sms', 'push'][Math.floor(Math.random() * 3)],
+                recipient: { email: 'user@example.com' },
+                subject: 'Test Notification',
+                message: 'Test message content'
+            }),
+            detect_fraud: () => ({
+                order_data: { total: Math.random() * 5000 },
+                customer_data: {
+                    account_age_days: Math.floor(Math.random() * 365),
+                    previous_orders: Math.floor(Math.random() * 50)
                 },
-                detect_fraud: {
-                    order_data: { total: Math.random() * 5000 },
-                    customer_data: {
-                        account_age_days: Math.floor(Math.random() * 365),
-                        previous_orders: Math.floor(Math.random() * 50)
-                    },
-                    payment_data: { method: ['card', 'paypal', 'prepaid_card'][Math.floor(Math.random() * 3)] }
+                payment_data: { method: ['card', 'paypal', 'prepaid_card'][Math.floor(Math.random() * 3)] }
+            }),
+            segment_customer: () => ({
+                customer_id: 'CUST' + Math.floor(Math.random() * 10000),
+                purchase_history: {
+                    total_orders: Math.floor(Math.random() * 100),
+                    lifetime_value: Math.random() * 10000,
+                    days_since_last_order: Math.floor(Math.random() * 365)
                 },
-                segment_customer: {
-                    customer_id: 'CUST' + Math.floor(Math.random() * 10000),
-                    purchase_history: {
-                        total_orders: Math.floor(Math.random() * 100),
-                        lifetime_value: Math.random() * 10000,
-                        days_since_last_order: Math.floor(Math.random() * 365)
-                    },
-                    engagement_metrics: {
-                        email_open_rate: Math.random() * 0.5,
-                        app_usage_days_per_month: Math.floor(Math.random() * 30)
-                    }
+                engagement_metrics: {
+                    email_open_rate: Math.random() * 0.5,
+                    app_usage_days_per_month: Math.floor(Math.random() * 30)
                 }
-            };
+            })
+        };
 
-            return payloads[service] || {};
+        function generateTestPayload(service) {
+            const generate = payloadGenerators[service];
+            return generate ? generate() : {};
         }
     </script>
 </body>
 </html>
     """
-    return HTMLResponse(content=html_content)
+MONITOR_HTML_BYTES = MONITOR_HTML.encode('utf-8')
+MONITOR_ETAG = f'"{hashlib.blake2b(MONITOR_HTML_BYTES).hexdigest()[:16]}"'
+
+@app.get("/")
+async def root(request: Request):
+    """Serve the real-time monitor interface"""
+    # Body and ETag are built once; each request gets its own Response, since
+    # headers, cookies and background tasks set on one must not reach the next
+    if request.headers.get("if-none-match") == MONITOR_ETAG:
+        return Response(status_code=304, headers={"ETag": MONITOR_ETAG})
+    return HTMLResponse(content=MONITOR_HTML_BYTES, headers={"ETag": MONITOR_ETAG})
 
 @app.get("/api/metrics")
 async def get_metrics():
     """Get current metrics as JSON"""
-    return JSONResponse({
+    return OrjsonResponse({
         "mode": "on-demand",
         "total_operations": metrics["total_operations"],
-        "recent_calls": list(metrics["service_calls"])[-10:],
-        "last_activity": metrics["last_activity"]
+        "recent_calls": [{**call, "timestamp": _iso(call["ts"])} for call in metrics["service_calls"].recent(10)],
+        "last_activity": _iso_second(metrics["last_activity"]) if metrics["last_activity"] else None
     })
 
 if __name__ == "__main__":
@@ -645,4 +909,17 @@ if __name__ == "__main__":
     print("\n🚀 DBBasic On-Demand Monitor Starting...")
     print("   Services only run when explicitly called")
     print("   No continuous simulation - pure on-demand processing\n")
-    uvicorn.run(app, host="0.0.0.0", port=8005)
\ No newline at end of file
+
+    # libuv event loop and C HTTP parser (both ship with uvicorn[standard], not on Windows)
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "h11"
+
+    uvicorn.run(app, host="0.0.0.0", port=8005, loop=loop, http=http, ws="websockets")
\ No newline at end of file
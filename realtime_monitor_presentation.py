@@ -78,7 +78,7 @@ def get_realtime_monitor_ui():
                     {
                         'type': 'card',
                         'title': '📡 Live Service Calls',
-                        'body': '<div id="serviceCalls" class="activity-feed" style="height: 400px; overflow-y: auto;"></div>'
+                        'body': '<div id="serviceCalls" class="activity-feed" style="height: 400px; overflow-y: auto; display: flex; flex-direction: column;"></div>'
                     },
                     '</div>',
 
@@ -87,7 +87,7 @@ def get_realtime_monitor_ui():
                     {
                         'type': 'card',
                         'title': '💾 Database Operations',
-                        'body': '<div id="dbOperations" class="activity-feed" style="height: 400px; overflow-y: auto;"></div>'
+                        'body': '<div id="dbOperations" class="activity-feed" style="height: 400px; overflow-y: auto; display: flex; flex-direction: column;"></div>'
                     },
                     '</div>',
 
@@ -117,48 +117,145 @@ def get_realtime_monitor_ui():
                     '<div id="connectionStatus" class="badge bg-secondary">Connecting...</div>',
                     '</div>',
 
-                    # Add WebSocket JavaScript
+                    # WebSocket worker: socket, JSON parsing and batching run off the UI thread
                     '''
-                    <script>
-                    let ws = null;
+                    <script type="text/js-worker" id="monitorWorkerSource">
+                    const FEED_LIMIT = 20;
+                    const FLUSH_MS = 16;
+                    const frameDecoder = new TextDecoder();
                     let reconnectInterval = null;
+                    let metricsState = {};
+                    let metricsDirty = false;
+                    let serviceCalls = [];
+                    let dbOps = [];
+                    let tableCounts = {};
+                    let tableRates = {};
+                    let flushTimer = null;
 
                     function connectWebSocket() {
-                        ws = new WebSocket('ws://localhost:8004/ws');
+                        const ws = new WebSocket('ws://localhost:8004/ws');
+                        ws.binaryType = 'arraybuffer';  // server sends UTF-8 JSON as binary frames
 
                         ws.onopen = function() {
-                            document.getElementById('connectionStatus').className = 'badge bg-success';
-                            document.getElementById('connectionStatus').textContent = '🟢 Connected';
                             clearInterval(reconnectInterval);
+                            reconnectInterval = null;
+                            postMessage({status: 'connected'});
                         };
 
                         ws.onmessage = function(event) {
-                            const data = JSON.parse(event.data);
-
-                            if (data.type === 'metrics') {
-                                updateMetrics(data.data);
-                            } else if (data.type === 'service_call') {
-                                addServiceCall(data.data);
-                            } else if (data.type === 'db_operation') {
-                                addDbOperation(data.data);
+                            const data = JSON.parse(
+                                typeof event.data === 'string' ? event.data : frameDecoder.decode(event.data));
+
+                            if (data.type === 'batch') {
+                                // The server coalesces bursts into one frame; items keep their order
+                                data.items.forEach(handleMessage);
+                            } else {
+                                handleMessage(data);
+                            }
+                            if (!flushTimer) {
+                                flushTimer = setTimeout(flush, FLUSH_MS);
                             }
                         };
 
                         ws.onclose = function() {
-                            document.getElementById('connectionStatus').className = 'badge bg-danger';
-                            document.getElementById('connectionStatus').textContent = '🔴 Disconnected';
+                            postMessage({status: 'disconnected'});
 
                             // Attempt to reconnect every 3 seconds
                             if (!reconnectInterval) {
                                 reconnectInterval = setInterval(connectWebSocket, 3000);
                             }
                         };
+                    }
+
+                    function handleMessage(data) {
+                        if (data.type === 'metrics') {
+                            metricsState = data.data;
+                            metricsDirty = true;
+                        } else if (data.type === 'metrics_delta') {
+                            Object.assign(metricsState, data.data);
+                            metricsDirty = true;
+                        } else if (data.type === 'sc') {
+                            // Only the newest FEED_LIMIT calls can ever be shown
+                            serviceCalls.push(data);
+                            if (serviceCalls.length > FEED_LIMIT) serviceCalls.shift();
+                        } else if (data.type === 'db_operation') {
+                            const op = data.data;
+                            dbOps.push(op);
+                            if (dbOps.length > FEED_LIMIT) dbOps.shift();
+                            // Every operation is counted, even ones that never reach the feed
+                            if (op.table) {
+                                tableCounts[op.table] = (tableCounts[op.table] || 0) + 1;
+                                tableRates[op.table] = op.rate || 0;
+                            }
+                        }
+                    }
+
+                    function flush() {
+                        // One coalesced update per FLUSH_MS window
+                        flushTimer = null;
+                        if (!metricsDirty && !serviceCalls.length && !dbOps.length) return;
+                        postMessage({metrics: metricsDirty ? metricsState : null, serviceCalls, dbOps, tableCounts, tableRates});
+                        metricsDirty = false;
+                        serviceCalls = [];
+                        dbOps = [];
+                        tableCounts = {};
+                        tableRates = {};
+                    }
+
+                    connectWebSocket();
+                    </script>
+                    ''',
 
-                        ws.onerror = function(error) {
-                            console.error('WebSocket error:', error);
+                    # Dashboard updates, applied once per animation frame
+                    '''
+                    <script>
+                    const FEED_LIMIT = 20;
+                    let metricsState = {};
+                    let metricsDirty = false;
+                    let pendingCalls = [];
+                    let pendingDbOps = [];
+                    let flushScheduled = false;
+
+                    // Table counters live in JS; the DOM is only ever written, never read back
+                    const tableOps = {};
+                    const tableRates = {};
+                    const dirtyTables = new Set();
+
+                    // Fixed ring of feed entry nodes per activity feed
+                    const feedRings = {};
+
+                    function startMonitorWorker() {
+                        const source = document.getElementById('monitorWorkerSource').textContent;
+                        const worker = new Worker(URL.createObjectURL(new Blob([source], {type: 'text/javascript'})));
+
+                        worker.onmessage = function(event) {
+                            const update = event.data;
+
+                            if (update.status) {
+                                setConnectionStatus(update.status === 'connected');
+                                return;
+                            }
+                            if (update.metrics) {
+                                metricsState = update.metrics;
+                                metricsDirty = true;
+                            }
+                            pendingCalls = pendingCalls.concat(update.serviceCalls).slice(-FEED_LIMIT);
+                            pendingDbOps = pendingDbOps.concat(update.dbOps).slice(-FEED_LIMIT);
+                            for (const table in update.tableCounts) {
+                                tableOps[table] = (tableOps[table] || 0) + update.tableCounts[table];
+                                tableRates[table] = update.tableRates[table];
+                                dirtyTables.add(table);
+                            }
+                            scheduleFlush();
                         };
                     }
 
+                    function setConnectionStatus(connected) {
+                        const status = document.getElementById('connectionStatus');
+                        status.className = connected ? 'badge bg-success' : 'badge bg-danger';
+                        status.textContent = connected ? '🟢 Connected' : '🔴 Disconnected';
+                    }
+
                     function updateMetrics(metrics) {
                         document.getElementById('opsPerSec').textContent =
                             metrics.operations_per_second ? metrics.operations_per_second.toLocaleString() : '0';
@@ -170,55 +267,98 @@ def get_realtime_monitor_ui():
                             metrics.active_connections || '0';
                     }
 
-                    function addServiceCall(data) {
-                        const feed = document.getElementById('serviceCalls');
-                        const entry = document.createElement('div');
-                        entry.className = 'alert alert-info py-2 mb-2';
-                        entry.innerHTML = `
-                            <small class="text-muted">${new Date(data.timestamp).toLocaleTimeString()}</small><br>
-                            <strong>${data.service}</strong>: ${data.result}
-                        `;
-                        feed.insertBefore(entry, feed.firstChild);
-
-                        // Keep only last 20 entries
-                        while (feed.children.length > 20) {
-                            feed.removeChild(feed.lastChild);
+                    function scheduleFlush() {
+                        if (!flushScheduled) {
+                            flushScheduled = true;
+                            requestAnimationFrame(flushUpdates);
+                        }
+                    }
+
+                    function flushUpdates() {
+                        flushScheduled = false;
+
+                        if (metricsDirty) {
+                            metricsDirty = false;
+                            updateMetrics(metricsState);
+                        }
+                        if (pendingCalls.length) {
+                            pendingCalls.forEach(addServiceCall);
+                            pendingCalls = [];
+                        }
+                        if (pendingDbOps.length) {
+                            pendingDbOps.forEach(addDbOperation);
+                            pendingDbOps = [];
+                        }
+                        if (dirtyTables.size) {
+                            writeTableStats();
+                        }
+                    }
+
+                    function createFeedRing(feedId) {
+                        // FEED_LIMIT entry nodes made once and reused; CSS order puts the newest on top
+                        const feed = document.getElementById(feedId);
+                        const ring = {nodes: [], head: 0, counter: 0};
+                        for (let i = 0; i < FEED_LIMIT; i++) {
+                            const node = document.createElement('div');
+                            node.className = 'alert alert-info py-2 mb-2';
+                            node.style.display = 'none';
+                            node.innerHTML = '<small class="text-muted"></small><br><strong></strong><span></span>';
+                            ring.nodes.push(node);
+                            feed.appendChild(node);
                         }
+                        feedRings[feedId] = ring;
+                    }
+
+                    function nextFeedNode(feedId) {
+                        // Recycle the oldest slot instead of creating and removing a node per event
+                        const ring = feedRings[feedId];
+                        const node = ring.nodes[ring.head];
+                        ring.head = (ring.head + 1) % FEED_LIMIT;
+                        node.style.order = -(++ring.counter);
+                        node.style.display = '';
+                        return node;
+                    }
+
+                    function addServiceCall(call) {
+                        // Compact frame: ts (epoch seconds), svc, ms (execution time), ok
+                        const node = nextFeedNode('serviceCalls');
+                        const parts = node.children;
+                        node.className = call.ok ? 'alert alert-info py-2 mb-2' : 'alert alert-warning py-2 mb-2';
+                        parts[0].textContent = new Date(call.ts * 1000).toLocaleTimeString();
+                        parts[2].textContent = call.svc;
+                        parts[3].textContent = `: ${call.ok ? 'ok' : 'failed'} in ${call.ms.toFixed(3)} ms`;
                     }
 
                     function addDbOperation(data) {
-                        const feed = document.getElementById('dbOperations');
-                        const entry = document.createElement('div');
-                        entry.className = 'alert alert-success py-2 mb-2';
-                        entry.innerHTML = `
-                            <small class="text-muted">${new Date(data.timestamp).toLocaleTimeString()}</small><br>
-                            <strong>${data.operation}</strong> on ${data.table}: ${data.count} rows
-                        `;
-                        feed.insertBefore(entry, feed.firstChild);
-
-                        // Update table stats
-                        if (data.table) {
-                            const opsElement = document.getElementById(data.table + '-ops');
+                        const node = nextFeedNode('dbOperations');
+                        const parts = node.children;
+                        node.className = 'alert alert-success py-2 mb-2';
+                        parts[0].textContent = new Date(data.timestamp).toLocaleTimeString();
+                        parts[2].textContent = data.operation;
+                        parts[3].textContent = ` on ${data.table}: ${data.count} rows`;
+                    }
+
+                    function writeTableStats() {
+                        // Write-only pass over the tables that changed since the last frame
+                        dirtyTables.forEach(function(table) {
+                            const opsElement = document.getElementById(table + '-ops');
                             if (opsElement) {
-                                const current = parseInt(opsElement.textContent) || 0;
-                                opsElement.textContent = (current + 1).toLocaleString();
+                                opsElement.textContent = tableOps[table].toLocaleString();
                             }
 
-                            const rateElement = document.getElementById(data.table + '-rate');
+                            const rateElement = document.getElementById(table + '-rate');
                             if (rateElement) {
-                                rateElement.textContent = data.rate ? data.rate.toLocaleString() : '0';
+                                rateElement.textContent = tableRates[table].toLocaleString();
                             }
-                        }
-
-                        // Keep only last 20 entries
-                        while (feed.children.length > 20) {
-                            feed.removeChild(feed.lastChild);
-                        }
+                        });
+                        dirtyTables.clear();
                     }
 
                     // Connect on page load
                     document.addEventListener('DOMContentLoaded', function() {
-                        connectWebSocket();
+                        createFeedRing('serviceCalls');
+                        createFeedRing('dbOperations');
+                        startMonitorWorker();
                     });
                     </script>
                     '''
@@ -227,9 +367,18 @@ def get_realtime_monitor_ui():
         ]
     }
 
+_CACHED_HTML = None
+
+def get_monitor_html():
+    """Rendered dashboard HTML - the structure is static, so it is rendered once"""
+    global _CACHED_HTML
+    if _CACHED_HTML is None:
+        _CACHED_HTML = PresentationLayer.render(get_realtime_monitor_ui(), 'bootstrap')
+    return _CACHED_HTML
+
 # Generate the HTML
 if __name__ == "__main__":
-    monitor_html = PresentationLayer.render(get_realtime_monitor_ui(), 'bootstrap')
+    monitor_html = get_monitor_html()
 
     # Save to file
     with open('realtime_monitor_new.html', 'w') as f:
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the services: response timestamps.
+The leading underscore keeps the service builder from loading this as a service.
+"""
+
+from typing import Optional, Tuple
+from datetime import datetime, timedelta
+import time
+
+# Local-time ISO prefix for the current second; rebuilt once per second
+_ISO_SECOND: Tuple[Optional[int], str] = (None, '')
+# Same for a (now, now + delta) pair; keyed on the delta as well
+_OFFSET_SECOND: Tuple[Optional[int], Optional[timedelta], str, str] = (None, None, '', '')
+
+def now_iso() -> str:
+    """Same string as datetime.now().isoformat(), formatting only the microseconds per call"""
+    global _ISO_SECOND
+    second, micro = divmod(time.time_ns() // 1000, 1_000_000)
+    if second != _ISO_SECOND[0]:
+        _ISO_SECOND = (second, datetime.fromtimestamp(second).isoformat())
+    return f"{_ISO_SECOND[1]}.{micro:06d}" if micro else _ISO_SECOND[1]
+
+def now_and_offset_iso(delta: timedelta) -> Tuple[str, str]:
+    """now_iso() and the same instant shifted by delta, from one clock read"""
+    global _OFFSET_SECOND
+    second, micro = divmod(time.time_ns() // 1000, 1_000_000)
+    if second != _OFFSET_SECOND[0] or delta != _OFFSET_SECOND[1]:
+        now = datetime.fromtimestamp(second)
+        _OFFSET_SECOND = (second, delta, now.isoformat(), (now + delta).isoformat())
+    if not micro:
+        return _OFFSET_SECOND[2], _OFFSET_SECOND[3]
+    fraction = f".{micro:06d}"
+    return _OFFSET_SECOND[2] + fraction, _OFFSET_SECOND[3] + fraction
+
+__all__ = ['now_iso', 'now_and_offset_iso']
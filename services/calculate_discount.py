@@ -6,13 +6,24 @@ Description: Calculate discount based on customer loyalty level and order amount
 Generated: 2025-09-18T14:18:22.752042
 """
 
-from typing import Dict, Any, Optional
-import json
-import asyncio
-from datetime import datetime
+from typing import Dict, Any
+from types import MappingProxyType
+
+try:
+    from services._clock import now_iso
+except ImportError:  # loaded with the services directory itself on sys.path
+    from _clock import now_iso
+
+# Loyalty discount rate per customer type; unknown types get none
+_LOYALTY = MappingProxyType({'premium': 0.15, 'gold': 0.10, 'silver': 0.05})
+_LOYALTY_LABELS = MappingProxyType({'premium': '15% premium', 'gold': '10% gold', 'silver': '5% silver'})
+
+# Orders above this amount get an extra 5%
+LARGE_ORDER_THRESHOLD = 500
+LARGE_ORDER_RATE = 0.05
 
 # AI-Generated Implementation
-async def calculate_discount(data: Dict[str, Any]) -> Dict[str, Any]:
+def _calculate_discount_impl(data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Calculate discount based on customer loyalty level and order amount. Premium customers get 15%, Gold get 10%, Silver get 5%. Additional 5% for orders over $500.
     
@@ -21,50 +32,56 @@ async def calculate_discount(data: Dict[str, Any]) -> Dict[str, Any]:
     """
     
     try:
-        # Extract inputs
-        customer_type = data.get('customer_type', None)
-        order_amount = data.get('order_amount', None)
+        # Extract inputs (customer_tier / order_total are accepted as aliases)
+        customer_type = data.get('customer_type', data.get('customer_tier'))
+        order_amount = data.get('order_amount', data.get('order_total'))
+
+        # Validate once up front; everything below is plain arithmetic
+        if isinstance(order_amount, bool) or not isinstance(order_amount, (int, float)) or order_amount < 0:
+            return {
+                "success": False,
+                "error": "order_amount must be a non-negative number",
+                "timestamp": now_iso()
+            }
+        if isinstance(customer_type, str):
+            customer_type = customer_type.lower()
 
-        # AI-Generated Business Logic
-        # Calculate discount based on rules
-        discount_amount = 0
-        discount_reason = []
-        
-        # Loyalty discount
-        if customer_type == 'premium':
-            discount_amount += order_total * 0.1
-            discount_reason.append('10% premium member discount')
-        
-        # Volume discount
-        if quantity >= 10:
-            discount_amount += order_total * 0.05
-            discount_reason.append('5% bulk discount')
-        
+        rate = _LOYALTY.get(customer_type, 0.0)
+        reasons = [_LOYALTY_LABELS[customer_type] + ' loyalty discount'] if rate else []
+        if order_amount > LARGE_ORDER_THRESHOLD:
+            rate += LARGE_ORDER_RATE
+            reasons.append('5% large order discount')
+
+        discount_amount = order_amount * rate
         result = {
-            'original_total': order_total,
             'discount_amount': round(discount_amount, 2),
-            'final_total': round(order_total - discount_amount, 2),
-            'discount_reasons': discount_reason
+            'final_price': round(order_amount - discount_amount, 2),
+            'discount_percentage': round(rate * 100, 2),
+            'discount_reason': ', '.join(reasons) if reasons else 'No discount'
         }
-        
+    
         # Return results
         return {
             "success": True,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "data": result
         }
-        
+
     except Exception as e:
         return {
             "success": False,
             "error": str(e),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
 
+async def calculate_discount(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Async entry point - the work never awaits, so it runs inline"""
+    return _calculate_discount_impl(data)
+
 # Synchronous wrapper for compatibility
 def calculate_discount_sync(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Synchronous wrapper for the async function"""
-    return asyncio.run(calculate_discount(data))
+    """Synchronous entry point - calls the core directly, no event loop per call"""
+    return _calculate_discount_impl(data)
 
 # Export the service
 __all__ = ['calculate_discount', 'calculate_discount_sync']
@@ -6,10 +6,57 @@ Generated: 2025-09-19T10:30:00.000000
 """
 
 from typing import Dict, Any, List
-import json
-from datetime import datetime
-
-async def calculate_order_total(data: Dict[str, Any]) -> Dict[str, Any]:
+from types import MappingProxyType
+
+try:
+    import numpy as np
+except ImportError:  # batch path falls back to one order at a time
+    np = None
+
+try:
+    from services._clock import now_iso
+except ImportError:  # loaded with the services directory itself on sys.path
+    from _clock import now_iso
+
+# State sales tax; unknown states use DEFAULT_TAX_RATE
+TAX_RATES = MappingProxyType({
+    'CA': 0.0725,  # California
+    'TX': 0.0625,  # Texas
+    'NY': 0.08,    # New York
+    'FL': 0.06,    # Florida
+    'WA': 0.065,   # Washington
+    'OR': 0,       # Oregon (no sales tax)
+    'MT': 0,       # Montana (no sales tax)
+    'NH': 0,       # New Hampshire (no sales tax)
+    'DE': 0,       # Delaware (no sales tax)
+    'AK': 0,       # Alaska (no sales tax)
+})
+DEFAULT_TAX_RATE = 0.05
+
+# Additional city tax, keyed by (state, upper-cased city)
+CITY_TAX_RATES = MappingProxyType({
+    ('CA', 'SAN FRANCISCO'): 0.01,  # Additional 1% for SF
+    ('NY', 'NEW YORK'): 0.045,      # NYC additional tax
+    ('WA', 'SEATTLE'): 0.0365,      # Seattle additional tax
+})
+
+# Extra loyalty discount on top of the volume discount
+TIER_DISCOUNTS = MappingProxyType({'gold': 0.05, 'platinum': 0.10})
+
+def _discounts_applied(subtotal: float, customer_tier: Any) -> List[str]:
+    applied = []
+    if subtotal > 1000:
+        applied.append('Volume discount (10%)')
+    elif subtotal > 500:
+        applied.append('Volume discount (5%)')
+
+    if customer_tier == 'gold':
+        applied.append('Gold member discount (5%)')
+    elif customer_tier == 'platinum':
+        applied.append('Platinum member discount (10%)')
+    return applied
+
+def _calculate_order_total_impl(data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Calculate order total with tax based on customer location.
 
@@ -30,32 +77,12 @@ async def calculate_order_total(data: Dict[str, Any]) -> Dict[str, Any]:
             quantity = item.get('quantity', 1)
             subtotal += price * quantity
 
-        # Determine tax rate based on location
+        # Determine tax rate based on location (plus city tax for certain locations)
         state = customer_location.get('state', 'CA')
-        tax_rates = {
-            'CA': 0.0725,  # California
-            'TX': 0.0625,  # Texas
-            'NY': 0.08,    # New York
-            'FL': 0.06,    # Florida
-            'WA': 0.065,   # Washington
-            'OR': 0,       # Oregon (no sales tax)
-            'MT': 0,       # Montana (no sales tax)
-            'NH': 0,       # New Hampshire (no sales tax)
-            'DE': 0,       # Delaware (no sales tax)
-            'AK': 0,       # Alaska (no sales tax)
-        }
-
-        # Add city tax for certain locations
         city = customer_location.get('city', '').upper()
-        city_tax = 0
-        if state == 'CA' and city == 'SAN FRANCISCO':
-            city_tax = 0.01  # Additional 1% for SF
-        elif state == 'NY' and city == 'NEW YORK':
-            city_tax = 0.045  # NYC additional tax
-        elif state == 'WA' and city == 'SEATTLE':
-            city_tax = 0.0365  # Seattle additional tax
-
-        base_tax_rate = tax_rates.get(state, 0.05)  # Default 5% for unknown states
+        city_tax = CITY_TAX_RATES.get((state, city), 0)
+
+        base_tax_rate = TAX_RATES.get(state, DEFAULT_TAX_RATE)
         total_tax_rate = base_tax_rate + city_tax
 
         # Calculate tax
@@ -70,11 +97,10 @@ async def calculate_order_total(data: Dict[str, Any]) -> Dict[str, Any]:
             elif subtotal > 500:
                 discount_amount = subtotal * 0.05  # 5% off for orders over $500
 
-            # Loyalty discount (if customer data provided)
-            if data.get('customer_tier') == 'gold':
-                discount_amount += subtotal * 0.05  # Additional 5% for gold members
-            elif data.get('customer_tier') == 'platinum':
-                discount_amount += subtotal * 0.10  # Additional 10% for platinum
+            # Loyalty discount (if customer data provided) - one table lookup
+            customer_tier = data.get('customer_tier')
+            if customer_tier in TIER_DISCOUNTS:
+                discount_amount += subtotal * TIER_DISCOUNTS[customer_tier]
 
         # Calculate final total
         total = subtotal - discount_amount + tax_amount
@@ -91,19 +117,11 @@ async def calculate_order_total(data: Dict[str, Any]) -> Dict[str, Any]:
 
         # List applied discounts
         if discount_amount > 0:
-            if subtotal > 1000:
-                result['discounts_applied'].append('Volume discount (10%)')
-            elif subtotal > 500:
-                result['discounts_applied'].append('Volume discount (5%)')
-
-            if data.get('customer_tier') == 'gold':
-                result['discounts_applied'].append('Gold member discount (5%)')
-            elif data.get('customer_tier') == 'platinum':
-                result['discounts_applied'].append('Platinum member discount (10%)')
+            result['discounts_applied'] = _discounts_applied(subtotal, data.get('customer_tier'))
 
         return {
             "success": True,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "data": result
         }
 
@@ -111,13 +129,95 @@ async def calculate_order_total(data: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "success": False,
             "error": str(e),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
 
+async def calculate_order_total(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Async entry point - the work never awaits, so it runs inline"""
+    return _calculate_order_total_impl(data)
+
 # Synchronous wrapper
 def calculate_order_total_sync(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Synchronous wrapper for the async function"""
-    import asyncio
-    return asyncio.run(calculate_order_total(data))
-
-__all__ = ['calculate_order_total', 'calculate_order_total_sync']
\ No newline at end of file
+    """Synchronous entry point - calls the core directly, no event loop per call"""
+    return _calculate_order_total_impl(data)
+
+def _float_array(values: List[Any]):
+    """float64 array of Python numbers; anything else raises, as the scalar arithmetic would"""
+    if not all(type(value) in (int, float, bool) for value in values):
+        raise TypeError('non-numeric value')
+    return np.array(values, np.float64)
+
+def _batch_arrays(orders: List[Dict[str, Any]]):
+    """Per-order inputs as NumPy arrays (raises on malformed input)"""
+    n = len(orders)
+    items = [order.get('items', []) for order in orders]
+    counts = np.fromiter((len(order_items) for order_items in items), np.int64, n)
+    line_values = [item.get('price', 0) * item.get('quantity', 1) for order_items in items for item in order_items]
+    # np.fromiter would quietly parse '5' or map None to nan; the scalar path errors on both
+    line_totals = _float_array(line_values)
+    # Ragged items -> one subtotal per order
+    order_index = np.repeat(np.arange(n), counts)
+    subtotals = np.bincount(order_index, weights=line_totals, minlength=n)
+    # The scalar path's subtotal stays an int unless some line total is a float
+    float_lines = np.fromiter((type(value) is float for value in line_values), bool, len(line_values))
+    int_subtotals = np.bincount(order_index, weights=float_lines, minlength=n) == 0
+
+    locations = [order.get('customer_location', {}) for order in orders]
+    states = [location.get('state', 'CA') for location in locations]
+    cities = [location.get('city', '').upper() for location in locations]
+    rates = [TAX_RATES.get(state, DEFAULT_TAX_RATE) + CITY_TAX_RATES.get((state, city), 0)
+             for state, city in zip(states, cities)]
+    tax_rates = np.array(rates, np.float64)
+    tiers = [order.get('customer_tier') for order in orders]
+    tier_rates = np.fromiter((TIER_DISCOUNTS.get(tier, 0.0) for tier in tiers), np.float64, n)
+    apply = np.fromiter((bool(order.get('apply_discounts', True)) for order in orders), bool, n)
+    return subtotals, int_subtotals, rates, tax_rates, tier_rates, apply, states, cities, tiers
+
+def calculate_order_total_batch(orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Calculate many order totals at once; results match calculate_order_total_sync per order.
+    Subtotals, tax and discounts are computed as NumPy arrays over the whole batch.
+    """
+    if np is None or not orders:
+        return [_calculate_order_total_impl(order) for order in orders]
+    try:
+        (subtotals, int_subtotals, rates, tax_rates, tier_rates, apply,
+         states, cities, tiers) = _batch_arrays(orders)
+    except Exception:
+        # A malformed order - let each one report its own error
+        return [_calculate_order_total_impl(order) for order in orders]
+
+    volume_rates = np.where(subtotals > 1000, 0.10, np.where(subtotals > 500, 0.05, 0.0))
+    # inf/nan prices give nan as on the scalar path, which does not warn about it
+    with np.errstate(invalid='ignore'):
+        tax = subtotals * tax_rates
+        # Only multiply where a discount applies: the scalar path never adds inf * 0
+        volume = np.multiply(subtotals, volume_rates, out=np.zeros(len(orders)), where=volume_rates > 0)
+        loyalty = np.multiply(subtotals, tier_rates, out=np.zeros(len(orders)), where=tier_rates > 0)
+        discounts = np.where(apply, volume + loyalty, 0.0)
+        totals = subtotals - discounts + tax
+
+    timestamp = now_iso()
+    results = []
+    for subtotal, tax_amount, rate, discount, total, int_subtotal, applied, state, city, tier in zip(
+            subtotals.tolist(), tax.tolist(), rates, discounts.tolist(), totals.tolist(),
+            int_subtotals.tolist(), apply.tolist(), states, cities, tiers):
+        # Where the scalar path's arithmetic stays in ints, return ints as it does (800, not 800.0)
+        int_tax = int_subtotal and type(rate) is int
+        int_discount = not applied or (not subtotal > 500 and tier not in TIER_DISCOUNTS)
+        results.append({
+            "success": True,
+            "timestamp": timestamp,
+            "data": {
+                'subtotal': int(subtotal) if int_subtotal else round(subtotal, 2),
+                'tax_amount': int(tax_amount) if int_tax else round(tax_amount, 2),
+                'tax_rate': round(rate * 100, 2),  # As percentage
+                'discount_amount': int(discount) if int_discount else round(discount, 2),
+                'total': int(total) if int_tax and int_discount else round(total, 2),
+                'location_used': f"{city}, {state}" if city else state,
+                'discounts_applied': _discounts_applied(subtotal, tier) if discount > 0 else []
+            }
+        })
+    return results
+
+__all__ = ['calculate_order_total', 'calculate_order_total_sync', 'calculate_order_total_batch']
\ No newline at end of file
@@ -8,11 +8,26 @@ Generated: 2025-09-19T09:15:41.522895
 
 from typing import Dict, Any, Optional
 import json
-import asyncio
 from datetime import datetime
+from types import MappingProxyType
+
+try:
+    from services._clock import now_iso
+except ImportError:  # loaded with the services directory itself on sys.path
+    from _clock import now_iso
+
+# Cost multiplier per shipping speed; unknown speeds ship at the standard rate
+SPEED_MULTIPLIERS = MappingProxyType({
+    'standard': 1.0,
+    'express': 1.5,
+    'overnight': 2.5
+})
+
+# Delivery estimate in days per shipping speed; anything else ships standard
+DELIVERY_DAYS = MappingProxyType({'overnight': 1, 'express': 2})
 
 # AI-Generated Implementation
-async def calculate_shipping(data: Dict[str, Any]) -> Dict[str, Any]:
+def _calculate_shipping_impl(data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Calculate shipping cost based on weight and destination. Express costs 50% more than standard. Add $5 for fragile items. Free shipping over $100.
     
@@ -32,12 +47,7 @@ async def calculate_shipping(data: Dict[str, Any]) -> Dict[str, Any]:
         base_cost = weight * 2.5  # $2.50 per pound
         
         # Apply shipping speed multiplier
-        speed_multipliers = {
-            'standard': 1.0,
-            'express': 1.5,
-            'overnight': 2.5
-        }
-        multiplier = speed_multipliers.get(shipping_speed, 1.0)
+        multiplier = SPEED_MULTIPLIERS.get(shipping_speed, 1.0)
         cost = base_cost * multiplier
         
         # Add handling fees
@@ -54,13 +64,13 @@ async def calculate_shipping(data: Dict[str, Any]) -> Dict[str, Any]:
             'shipping_cost': round(cost, 2),
             'free_shipping_applied': free_shipping,
             'carrier': 'UPS' if shipping_speed == 'express' else 'USPS',
-            'estimated_days': 1 if shipping_speed == 'overnight' else (2 if shipping_speed == 'express' else 5)
+            'estimated_days': DELIVERY_DAYS.get(shipping_speed, 5)
         }
         
         # Return results
         return {
             "success": True,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "data": result
         }
         
@@ -68,13 +78,17 @@ async def calculate_shipping(data: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "success": False,
             "error": str(e),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
 
+async def calculate_shipping(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Async entry point - the work never awaits, so it runs inline"""
+    return _calculate_shipping_impl(data)
+
 # Synchronous wrapper for compatibility
 def calculate_shipping_sync(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Synchronous wrapper for the async function"""
-    return asyncio.run(calculate_shipping(data))
+    """Synchronous entry point - calls the core directly, no event loop per call"""
+    return _calculate_shipping_impl(data)
 
 # Export the service
 __all__ = ['calculate_shipping', 'calculate_shipping_sync']
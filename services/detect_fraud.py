@@ -5,31 +5,144 @@ Description: Score orders for fraud risk using multiple signals
 Generated: 2025-09-19T10:32:00.000000
 """
 
-from typing import Dict, Any, List, Optional
-import json
-from datetime import datetime, timedelta
-import hashlib
-import random
-
-async def detect_fraud(data: Dict[str, Any]) -> Dict[str, Any]:
+from typing import Dict, Any, Final, List, Tuple
+import re
+from bisect import bisect_right
+
+try:
+    from services._clock import now_iso
+except ImportError:  # loaded with the services directory itself on sys.path
+    from _clock import now_iso
+
+# score_breakdown categories, as bits so a reason code can count towards several
+CAT_ORDER: Final = 1
+CAT_CUSTOMER: Final = 2
+CAT_PAYMENT: Final = 4
+CAT_SHIPPING: Final = 8
+CAT_VELOCITY: Final = 16
+CAT_DEVICE: Final = 32
+
+# (breakdown key, category bit, points per code, cap), in CAT_* bit order
+_BREAKDOWN: Final[Tuple[Tuple[str, int, int, int], ...]] = (
+    ('order_risk', CAT_ORDER, 15, 40),
+    ('customer_risk', CAT_CUSTOMER, 15, 30),
+    ('payment_risk', CAT_PAYMENT, 15, 35),
+    ('shipping_risk', CAT_SHIPPING, 10, 25),
+    ('velocity_risk', CAT_VELOCITY, 25, 40),
+    ('device_risk', CAT_DEVICE, 20, 35),
+)
+
+_CODE_CATS: Final[Dict[str, int]] = {
+    'HIGH_ORDER_VALUE': CAT_ORDER,
+    'ELEVATED_ORDER_VALUE': CAT_ORDER,
+    'FIRST_ORDER_HIGH_VALUE': CAT_ORDER,
+    'NEW_ACCOUNT': CAT_CUSTOMER,
+    'RECENT_ACCOUNT': CAT_CUSTOMER,
+    'PREPAID_CARD': CAT_PAYMENT,
+    'CVV_FAILED': CAT_PAYMENT,
+    'ZIP_MISMATCH': CAT_PAYMENT,
+    'ADDRESS_MISMATCH': CAT_SHIPPING,
+    'PO_BOX_HIGH_VALUE': CAT_SHIPPING | CAT_ORDER,
+    'HIGH_RISK_COUNTRY': CAT_SHIPPING,
+    'VELOCITY_HOUR': CAT_VELOCITY,
+    'VELOCITY_DAY': CAT_VELOCITY,
+    'VPN_DETECTED': CAT_DEVICE,
+    'MULTI_ACCOUNT_DEVICE': CAT_DEVICE | CAT_CUSTOMER,
+    'DISPOSABLE_EMAIL': 0,
+}
+
+# Code -> indexes into _BREAKDOWN, unpacked from the bits once at import
+_CODE_INDEXES: Final[Dict[str, Tuple[int, ...]]] = {
+    code: tuple(i for i, (_, bit, _, _) in enumerate(_BREAKDOWN) if mask & bit)
+    for code, mask in _CODE_CATS.items()
+}
+
+# Risk bands: fraud_score >= _THRESH[i] lands in _LEVELS[i + 1]
+_THRESH: Final = (15, 30, 50, 75)
+_LEVELS: Final[Tuple[Tuple[str, str], ...]] = (
+    ('minimal', 'approve'),
+    ('low', 'monitor'),
+    ('medium', 'additional_verification'),
+    ('high', 'manual_review'),
+    ('critical', 'block'),
+)
+_PRIORITY_THRESH: Final = (50, 75)
+_PRIORITIES: Final = ('normal', 'high', 'urgent')
+
+# Confidence by number of signals (0.7 + 3% each), rounded once at import
+_CONFIDENCE: Final[Tuple[float, ...]] = tuple(round(0.7 + n * 0.03, 2) for n in range(len(_CODE_CATS) + 1))
+
+# Optional 'flags' input: the boolean signals packed into one int, in check order
+FLAG_PREPAID_CARD: Final = 1
+FLAG_CVV_FAILED: Final = 2
+FLAG_ZIP_MISMATCH: Final = 4
+FLAG_ADDRESS_MISMATCH: Final = 8
+FLAG_PO_BOX: Final = 16
+FLAG_HIGH_RISK_COUNTRY: Final = 32
+FLAG_VPN: Final = 64
+FLAG_MULTI_ACCOUNT: Final = 128
+
+# (flag, points, signal, reason code); velocity is checked between the two groups
+_PAYMENT_SHIPPING_FLAGS: Final[Tuple[Tuple[int, int, str, str], ...]] = (
+    (FLAG_PREPAID_CARD, 15, 'Prepaid card used', 'PREPAID_CARD'),
+    (FLAG_CVV_FAILED, 35, 'Card verification failed', 'CVV_FAILED'),
+    (FLAG_ZIP_MISMATCH, 25, 'Billing ZIP mismatch', 'ZIP_MISMATCH'),
+    (FLAG_ADDRESS_MISMATCH, 10, 'Billing/shipping mismatch', 'ADDRESS_MISMATCH'),
+    (FLAG_PO_BOX, 15, 'PO Box for high value order', 'PO_BOX_HIGH_VALUE'),
+    (FLAG_HIGH_RISK_COUNTRY, 30, 'High risk country', 'HIGH_RISK_COUNTRY'),
+)
+_DEVICE_FLAGS: Final[Tuple[Tuple[int, int, str, str], ...]] = (
+    (FLAG_VPN, 20, 'VPN detected', 'VPN_DETECTED'),
+    (FLAG_MULTI_ACCOUNT, 35, 'Multiple accounts on device', 'MULTI_ACCOUNT_DEVICE'),
+)
+
+HIGH_RISK_COUNTRIES: Final = ('NG', 'RO', 'PK', 'ID')
+
+# Disposable-email providers, matched anywhere in the address in one pass
+_DISPOSABLE_RE: Final = re.compile(r'(?:tempmail|guerrillamail|10minutemail)', re.IGNORECASE)
+
+def _pack_flags(payment_data: Dict[str, Any], shipping_data: Dict[str, Any],
+                device_data: Dict[str, Any]) -> int:
+    """FLAG_* bits from the nested input dicts, for callers that don't send 'flags'"""
+    flags = 0
+    if payment_data.get('method', 'card') == 'prepaid_card':
+        flags |= FLAG_PREPAID_CARD
+    if payment_data.get('cvv_verification_failed', False):
+        flags |= FLAG_CVV_FAILED
+    if payment_data.get('billing_zip_mismatch', False):
+        flags |= FLAG_ZIP_MISMATCH
+    if shipping_data.get('different_from_billing', False):
+        flags |= FLAG_ADDRESS_MISMATCH
+    if shipping_data.get('is_po_box', False):
+        flags |= FLAG_PO_BOX
+    if shipping_data.get('country') in HIGH_RISK_COUNTRIES:
+        flags |= FLAG_HIGH_RISK_COUNTRY
+    if device_data.get('vpn_detected', False):
+        flags |= FLAG_VPN
+    if device_data.get('multiple_accounts', False):
+        flags |= FLAG_MULTI_ACCOUNT
+    return flags
+
+def _detect_fraud_impl(data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Analyze transaction data for fraud indicators and return a risk score.
 
-    Inputs: order_data, customer_data, payment_data, shipping_data
+    Inputs: order_data, customer_data, payment_data, shipping_data, device_data,
+            flags (optional FLAG_* int that replaces the payment/shipping/device booleans)
     Outputs: fraud_score, risk_level, signals_detected, action_recommended, reason_codes
     """
 
     try:
         # Extract inputs
-        order_data = data.get('order_data', {})
-        customer_data = data.get('customer_data', {})
-        payment_data = data.get('payment_data', {})
-        shipping_data = data.get('shipping_data', {})
+        order_data: Dict[str, Any] = data.get('order_data', {})
+        customer_data: Dict[str, Any] = data.get('customer_data', {})
+        payment_data: Dict[str, Any] = data.get('payment_data', {})
+        shipping_data: Dict[str, Any] = data.get('shipping_data', {})
 
         # Initialize fraud scoring
-        fraud_score = 0
-        signals_detected = []
-        reason_codes = []
+        fraud_score: int = 0
+        signals_detected: List[str] = []
+        reason_codes: List[str] = []
 
         # 1. Check order value anomalies
         order_total = order_data.get('total', 0)
@@ -62,45 +175,18 @@ async def detect_fraud(data: Dict[str, Any]) -> Dict[str, Any]:
             signals_detected.append('First order high value')
             reason_codes.append('FIRST_ORDER_HIGH_VALUE')
 
-        # 3. Check payment method risks
-        payment_method = payment_data.get('method', 'card')
-        card_verification_failed = payment_data.get('cvv_verification_failed', False)
-        billing_zip_mismatch = payment_data.get('billing_zip_mismatch', False)
-
-        if payment_method == 'prepaid_card':
-            fraud_score += 15
-            signals_detected.append('Prepaid card used')
-            reason_codes.append('PREPAID_CARD')
-
-        if card_verification_failed:
-            fraud_score += 35
-            signals_detected.append('Card verification failed')
-            reason_codes.append('CVV_FAILED')
-
-        if billing_zip_mismatch:
-            fraud_score += 25
-            signals_detected.append('Billing ZIP mismatch')
-            reason_codes.append('ZIP_MISMATCH')
-
-        # 4. Check shipping address risks
-        billing_shipping_mismatch = shipping_data.get('different_from_billing', False)
-        po_box_address = shipping_data.get('is_po_box', False)
-        high_risk_country = shipping_data.get('country') in ['NG', 'RO', 'PK', 'ID']
-
-        if billing_shipping_mismatch:
-            fraud_score += 10
-            signals_detected.append('Billing/shipping mismatch')
-            reason_codes.append('ADDRESS_MISMATCH')
+        # 3-4. Payment and shipping risks, 6. device fingerprint: one bit per signal
+        packed = data.get('flags')
+        flags: int = (_pack_flags(payment_data, shipping_data, data.get('device_data', {}))
+                      if packed is None else packed)
+        if flags & FLAG_PO_BOX and not order_total > 200:
+            flags &= ~FLAG_PO_BOX  # a PO box only counts on a high value order
 
-        if po_box_address and order_total > 200:
-            fraud_score += 15
-            signals_detected.append('PO Box for high value order')
-            reason_codes.append('PO_BOX_HIGH_VALUE')
-
-        if high_risk_country:
-            fraud_score += 30
-            signals_detected.append('High risk country')
-            reason_codes.append('HIGH_RISK_COUNTRY')
+        for bit, points, signal, code in _PAYMENT_SHIPPING_FLAGS:
+            if flags & bit:
+                fraud_score += points
+                signals_detected.append(signal)
+                reason_codes.append(code)
 
         # 5. Check velocity patterns
         orders_last_hour = customer_data.get('orders_last_hour', 0)
@@ -116,48 +202,24 @@ async def detect_fraud(data: Dict[str, Any]) -> Dict[str, Any]:
             reason_codes.append('VELOCITY_DAY')
 
         # 6. Check device fingerprint
-        device_data = data.get('device_data', {})
-        vpn_detected = device_data.get('vpn_detected', False)
-        multiple_accounts_same_device = device_data.get('multiple_accounts', False)
-
-        if vpn_detected:
-            fraud_score += 20
-            signals_detected.append('VPN detected')
-            reason_codes.append('VPN_DETECTED')
-
-        if multiple_accounts_same_device:
-            fraud_score += 35
-            signals_detected.append('Multiple accounts on device')
-            reason_codes.append('MULTI_ACCOUNT_DEVICE')
+        for bit, points, signal, code in _DEVICE_FLAGS:
+            if flags & bit:
+                fraud_score += points
+                signals_detected.append(signal)
+                reason_codes.append(code)
 
         # 7. Email analysis
         email = customer_data.get('email', '')
-        if email:
-            disposable_email = any(domain in email.lower() for domain in ['tempmail', 'guerrillamail', '10minutemail'])
-            if disposable_email:
-                fraud_score += 25
-                signals_detected.append('Disposable email')
-                reason_codes.append('DISPOSABLE_EMAIL')
+        if email and _DISPOSABLE_RE.search(email):
+            fraud_score += 25
+            signals_detected.append('Disposable email')
+            reason_codes.append('DISPOSABLE_EMAIL')
 
         # Cap fraud score at 100
         fraud_score = min(fraud_score, 100)
 
         # Determine risk level and action
-        if fraud_score >= 75:
-            risk_level = 'critical'
-            action_recommended = 'block'
-        elif fraud_score >= 50:
-            risk_level = 'high'
-            action_recommended = 'manual_review'
-        elif fraud_score >= 30:
-            risk_level = 'medium'
-            action_recommended = 'additional_verification'
-        elif fraud_score >= 15:
-            risk_level = 'low'
-            action_recommended = 'monitor'
-        else:
-            risk_level = 'minimal'
-            action_recommended = 'approve'
+        risk_level, action_recommended = _LEVELS[bisect_right(_THRESH, fraud_score)]
 
         result = {
             'fraud_score': fraud_score,
@@ -165,24 +227,24 @@ async def detect_fraud(data: Dict[str, Any]) -> Dict[str, Any]:
             'signals_detected': signals_detected,
             'action_recommended': action_recommended,
             'reason_codes': reason_codes,
-            'confidence': round(0.7 + (len(signals_detected) * 0.03), 2),  # Higher confidence with more signals
-            'review_priority': 'urgent' if fraud_score >= 75 else ('high' if fraud_score >= 50 else 'normal'),
+            'confidence': _CONFIDENCE[len(signals_detected)],  # Higher confidence with more signals
+            'review_priority': _PRIORITIES[bisect_right(_PRIORITY_THRESH, fraud_score)],
             'estimated_loss_prevented': round(order_total * (fraud_score / 100), 2) if fraud_score >= 50 else 0
         }
 
-        # Add detailed breakdown
+        # Add detailed breakdown - one pass over the codes, no substring scans
+        category_counts: List[int] = [0] * len(_BREAKDOWN)
+        for code in reason_codes:
+            for i in _CODE_INDEXES[code]:
+                category_counts[i] += 1
         result['score_breakdown'] = {
-            'order_risk': min(40, sum(1 for code in reason_codes if 'ORDER' in code or 'VALUE' in code) * 15),
-            'customer_risk': min(30, sum(1 for code in reason_codes if 'ACCOUNT' in code) * 15),
-            'payment_risk': min(35, sum(1 for code in reason_codes if 'CARD' in code or 'CVV' in code or 'ZIP' in code) * 15),
-            'shipping_risk': min(25, sum(1 for code in reason_codes if 'ADDRESS' in code or 'PO_BOX' in code or 'COUNTRY' in code) * 10),
-            'velocity_risk': min(40, sum(1 for code in reason_codes if 'VELOCITY' in code) * 25),
-            'device_risk': min(35, sum(1 for code in reason_codes if 'VPN' in code or 'DEVICE' in code) * 20)
+            key: min(cap, count * points)
+            for (key, _, points, cap), count in zip(_BREAKDOWN, category_counts)
         }
 
         return {
             "success": True,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "data": result
         }
 
@@ -190,13 +252,16 @@ async def detect_fraud(data: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "success": False,
             "error": str(e),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
 
+async def detect_fraud(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Async entry point - the work never awaits, so it runs inline"""
+    return _detect_fraud_impl(data)
+
 # Synchronous wrapper
 def detect_fraud_sync(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Synchronous wrapper for the async function"""
-    import asyncio
-    return asyncio.run(detect_fraud(data))
+    """Synchronous entry point - calls the core directly, no event loop per call"""
+    return _detect_fraud_impl(data)
 
 __all__ = ['detect_fraud', 'detect_fraud_sync']
\ No newline at end of file
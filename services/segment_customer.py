@@ -5,11 +5,182 @@ Description: Categorize customers by value, behavior, and engagement
 Generated: 2025-09-19T10:33:00.000000
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import json
-from datetime import datetime, timedelta
+from datetime import timedelta
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from types import MappingProxyType
 
-async def segment_customer(data: Dict[str, Any]) -> Dict[str, Any]:
+try:
+    import numpy as np
+except ImportError:  # batch path falls back to one customer at a time
+    np = None
+
+try:
+    from services._clock import now_iso, now_and_offset_iso
+except ImportError:  # loaded with the services directory itself on sys.path
+    from _clock import now_iso, now_and_offset_iso
+
+# Customers are reviewed again 30 days (wall clock) after segmentation
+NEXT_REVIEW_DELTA = timedelta(days=30)
+
+# Banded labels: bisect over the thresholds indexes the labels.
+# Inclusive bands (>=) use _inclusive_band, exclusive ones (>) bisect_left
+LTV_THRESHOLDS = (500, 2000, 5000, 10000)
+LTV_TIERS = ('Bronze', 'Silver', 'Gold', 'Platinum', 'Diamond')
+VALUE_THRESHOLDS = (500, 2000)
+VALUE_INDICATORS = ('Low Value', 'Medium Value', 'High Value')
+ACTIVITY_THRESHOLDS = (1, 2)
+ACTIVITY_LEVELS = ('Inactive', 'Active', 'Highly Active')
+ENGAGEMENT_THRESHOLDS = (0.15, 0.3)
+ENGAGEMENT_LEVELS = ('Low Engagement', 'Engaged', 'Highly Engaged')
+CHURN_THRESHOLDS = (40, 70)
+CHURN_RISKS = ('Low', 'Medium', 'High')
+
+def _inclusive_band(thresholds: Tuple[float, ...], value: float) -> int:
+    """Count of thresholds value reaches (>=). NaN reaches none, as with the >= comparisons"""
+    return bisect_right(thresholds, value) if value == value else 0
+
+# Sub-segment of a VIP/Loyal customer gone quiet, as a prebuilt label
+LAPSED_SUB_SEGMENTS = MappingProxyType({
+    'Platinum': 'Lapsed Platinum',
+    'Gold': 'Lapsed Gold',
+    'Regular': 'Lapsed Regular'
+})
+
+# Playbook per segment; segments without one (Prospect) get none
+SEGMENT_RECOMMENDATIONS = MappingProxyType({
+    'VIP': (
+        'Assign dedicated account manager',
+        'Offer exclusive early access to new products',
+        'Provide VIP customer service line',
+        'Send personalized thank you gifts'
+    ),
+    'Loyal': (
+        'Enroll in loyalty rewards program',
+        'Send birthday and anniversary offers',
+        'Provide product recommendations based on history'
+    ),
+    'At Risk': (
+        'Send win-back campaign immediately',
+        'Offer special comeback discount',
+        'Survey to understand dissatisfaction',
+        'Personal outreach from customer success'
+    ),
+    'Active': (
+        'Encourage second purchase with discount',
+        'Send product education emails',
+        'Highlight customer reviews and testimonials'
+    ),
+    'New': (
+        'Send welcome series emails',
+        'Offer first-time buyer discount for next purchase',
+        'Request feedback on first experience'
+    ),
+    'Dormant': (
+        'Re-engagement email campaign',
+        'Special reactivation offer',
+        'Update on new products and improvements'
+    ),
+})
+CHANNEL_RECOMMENDATIONS = MappingProxyType({
+    'mobile': 'Optimize mobile app experience',
+    'social': 'Increase social media engagement',
+})
+
+def _recommendations(segment: str, preferred_channel: Any) -> List[str]:
+    recommendations = list(SEGMENT_RECOMMENDATIONS.get(segment, ()))
+    channel_recommendation = CHANNEL_RECOMMENDATIONS.get(preferred_channel)
+    if channel_recommendation:
+        recommendations.append(channel_recommendation)
+    return recommendations
+
+# Distinct numeric profiles remembered by _segment_profile
+PROFILE_CACHE_SIZE = 16384
+
+@lru_cache(maxsize=PROFILE_CACHE_SIZE, typed=True)
+def _segment_profile(total_purchases, lifetime_value, avg_order_value, days_since_last_order,
+                     purchase_frequency, email_open_rate, click_through_rate, app_usage_days,
+                     support_tickets, reviews_written, referrals_made) -> tuple:
+    """
+    Everything segment_customer derives from the numeric inputs, memoized on their exact values
+    (typed, so 1 and 1.0 stay apart). Returns an immutable tuple, safe to share between calls.
+    """
+    # Determine primary segment
+    if lifetime_value >= 10000 and purchase_frequency >= 2:
+        segment = 'VIP'
+        sub_segment = 'Platinum'
+    elif lifetime_value >= 5000 and purchase_frequency >= 1:
+        segment = 'VIP'
+        sub_segment = 'Gold'
+    elif lifetime_value >= 2000 or purchase_frequency >= 1:
+        segment = 'Loyal'
+        sub_segment = 'Regular'
+    elif total_purchases >= 2:
+        segment = 'Active'
+        sub_segment = 'Occasional'
+    elif total_purchases == 1:
+        segment = 'New'
+        sub_segment = 'First-time'
+    else:
+        segment = 'Prospect'
+        sub_segment = 'Potential'
+
+    # Refine based on recency
+    if days_since_last_order > 180:
+        if segment in ['VIP', 'Loyal']:
+            segment = 'At Risk'
+            sub_segment = LAPSED_SUB_SEGMENTS[sub_segment]
+        else:
+            segment = 'Dormant'
+            sub_segment = 'Inactive'
+    elif days_since_last_order > 90 and segment != 'VIP':
+        sub_segment = 'Cooling'
+
+    # Determine lifetime value tier
+    lifetime_value_tier = LTV_TIERS[_inclusive_band(LTV_THRESHOLDS, lifetime_value)]
+
+    # Calculate churn risk
+    churn_score = 0
+
+    if days_since_last_order > 60:
+        churn_score += 30
+    if days_since_last_order > 120:
+        churn_score += 30
+
+    if email_open_rate < 0.1:
+        churn_score += 20
+    if app_usage_days < 2:
+        churn_score += 20
+
+    if support_tickets > 3:
+        churn_score += 15
+
+    if purchase_frequency < 0.5:
+        churn_score += 15
+
+    churn_risk = CHURN_RISKS[bisect_right(CHURN_THRESHOLDS, churn_score)]
+
+    # Profile summary labels
+    value_indicator = VALUE_INDICATORS[_inclusive_band(VALUE_THRESHOLDS, lifetime_value)]
+    activity_level = ACTIVITY_LEVELS[_inclusive_band(ACTIVITY_THRESHOLDS, purchase_frequency)]
+    engagement_level = ENGAGEMENT_LEVELS[bisect_left(ENGAGEMENT_THRESHOLDS, email_open_rate)]
+    loyalty_status = 'Champion' if referrals_made > 2 else ('Advocate' if reviews_written > 3 else 'Customer')
+
+    # Calculate potential value
+    if segment in ['New', 'Active']:
+        potential_value = avg_order_value * 12 * 2  # Potential for 2 years
+    else:
+        potential_value = avg_order_value * purchase_frequency * 12
+
+    engagement_score = email_open_rate * 30 + click_through_rate * 30 + (app_usage_days/30) * 40
+
+    return (segment, sub_segment, lifetime_value_tier, churn_risk, churn_score, value_indicator,
+            activity_level, engagement_level, loyalty_status,
+            round(potential_value, 2), round(engagement_score, 2))
+
+def _segment_customer_impl(data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Segment customers into categories based on value, behavior, and engagement metrics.
 
@@ -44,151 +215,38 @@ async def segment_customer(data: Dict[str, Any]) -> Dict[str, Any]:
         location_tier = demographic_data.get('location_tier', 'suburban')  # urban, suburban, rural
         preferred_channel = demographic_data.get('preferred_channel', 'web')
 
-        # Determine primary segment
-        if lifetime_value >= 10000 and purchase_frequency >= 2:
-            segment = 'VIP'
-            sub_segment = 'Platinum'
-        elif lifetime_value >= 5000 and purchase_frequency >= 1:
-            segment = 'VIP'
-            sub_segment = 'Gold'
-        elif lifetime_value >= 2000 or purchase_frequency >= 1:
-            segment = 'Loyal'
-            sub_segment = 'Regular'
-        elif total_purchases >= 2:
-            segment = 'Active'
-            sub_segment = 'Occasional'
-        elif total_purchases == 1:
-            segment = 'New'
-            sub_segment = 'First-time'
-        else:
-            segment = 'Prospect'
-            sub_segment = 'Potential'
-
-        # Refine based on recency
-        if days_since_last_order > 180:
-            if segment in ['VIP', 'Loyal']:
-                segment = 'At Risk'
-                sub_segment = 'Lapsed ' + sub_segment
-            else:
-                segment = 'Dormant'
-                sub_segment = 'Inactive'
-        elif days_since_last_order > 90 and segment != 'VIP':
-            sub_segment = 'Cooling'
-
-        # Determine lifetime value tier
-        if lifetime_value >= 10000:
-            lifetime_value_tier = 'Diamond'
-        elif lifetime_value >= 5000:
-            lifetime_value_tier = 'Platinum'
-        elif lifetime_value >= 2000:
-            lifetime_value_tier = 'Gold'
-        elif lifetime_value >= 500:
-            lifetime_value_tier = 'Silver'
-        else:
-            lifetime_value_tier = 'Bronze'
-
-        # Calculate churn risk
-        churn_score = 0
-
-        if days_since_last_order > 60:
-            churn_score += 30
-        if days_since_last_order > 120:
-            churn_score += 30
-
-        if email_open_rate < 0.1:
-            churn_score += 20
-        if app_usage_days < 2:
-            churn_score += 20
-
-        if support_tickets > 3:
-            churn_score += 15
-
-        if purchase_frequency < 0.5:
-            churn_score += 15
-
-        churn_risk = 'High' if churn_score >= 70 else ('Medium' if churn_score >= 40 else 'Low')
-
-        # Generate recommendations based on segment
-        recommendations = []
-
-        if segment == 'VIP':
-            recommendations.extend([
-                'Assign dedicated account manager',
-                'Offer exclusive early access to new products',
-                'Provide VIP customer service line',
-                'Send personalized thank you gifts'
-            ])
-        elif segment == 'Loyal':
-            recommendations.extend([
-                'Enroll in loyalty rewards program',
-                'Send birthday and anniversary offers',
-                'Provide product recommendations based on history'
-            ])
-        elif segment == 'At Risk':
-            recommendations.extend([
-                'Send win-back campaign immediately',
-                'Offer special comeback discount',
-                'Survey to understand dissatisfaction',
-                'Personal outreach from customer success'
-            ])
-        elif segment == 'Active':
-            recommendations.extend([
-                'Encourage second purchase with discount',
-                'Send product education emails',
-                'Highlight customer reviews and testimonials'
-            ])
-        elif segment == 'New':
-            recommendations.extend([
-                'Send welcome series emails',
-                'Offer first-time buyer discount for next purchase',
-                'Request feedback on first experience'
-            ])
-        elif segment == 'Dormant':
-            recommendations.extend([
-                'Re-engagement email campaign',
-                'Special reactivation offer',
-                'Update on new products and improvements'
-            ])
-
-        # Add channel-specific recommendations
-        if preferred_channel == 'mobile':
-            recommendations.append('Optimize mobile app experience')
-        elif preferred_channel == 'social':
-            recommendations.append('Increase social media engagement')
-
-        # Build profile summary
-        profile_summary = {
-            'value_indicator': 'High Value' if lifetime_value >= 2000 else ('Medium Value' if lifetime_value >= 500 else 'Low Value'),
-            'activity_level': 'Highly Active' if purchase_frequency >= 2 else ('Active' if purchase_frequency >= 1 else 'Inactive'),
-            'engagement_level': 'Highly Engaged' if email_open_rate > 0.3 else ('Engaged' if email_open_rate > 0.15 else 'Low Engagement'),
-            'loyalty_status': 'Champion' if referrals_made > 2 else ('Advocate' if reviews_written > 3 else 'Customer'),
-            'preferred_channel': preferred_channel,
-            'customer_since': f"{account_age_months} months"
-        }
-
-        # Calculate potential value
-        if segment in ['New', 'Active']:
-            potential_value = avg_order_value * 12 * 2  # Potential for 2 years
-        else:
-            potential_value = avg_order_value * purchase_frequency * 12
+        # Segment, tier and scores - memoized on the numeric inputs
+        (segment, sub_segment, lifetime_value_tier, churn_risk, churn_score, value_indicator,
+         activity_level, engagement_level, loyalty_status, potential_value, engagement_score) = _segment_profile(
+            total_purchases, lifetime_value, avg_order_value, days_since_last_order, purchase_frequency,
+            email_open_rate, click_through_rate, app_usage_days, support_tickets, reviews_written, referrals_made
+        )
 
+        timestamp, next_review_date = now_and_offset_iso(NEXT_REVIEW_DELTA)
         result = {
             'segment': segment,
             'sub_segment': sub_segment,
             'lifetime_value_tier': lifetime_value_tier,
             'churn_risk': churn_risk,
             'churn_score': churn_score,
-            'recommendations': recommendations,
-            'profile_summary': profile_summary,
-            'potential_value': round(potential_value, 2),
-            'engagement_score': round((email_open_rate * 30 + click_through_rate * 30 + (app_usage_days/30) * 40), 2),
+            'recommendations': _recommendations(segment, preferred_channel),
+            'profile_summary': {
+                'value_indicator': value_indicator,
+                'activity_level': activity_level,
+                'engagement_level': engagement_level,
+                'loyalty_status': loyalty_status,
+                'preferred_channel': preferred_channel,
+                'customer_since': f"{account_age_months} months"
+            },
+            'potential_value': potential_value,
+            'engagement_score': engagement_score,
             'segment_confidence': 0.85,  # Could be calculated based on data completeness
-            'next_review_date': (datetime.now() + timedelta(days=30)).isoformat()
+            'next_review_date': next_review_date
         }
 
         return {
             "success": True,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp,
             "data": result
         }
 
@@ -196,13 +254,147 @@ async def segment_customer(data: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "success": False,
             "error": str(e),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
 
+async def segment_customer(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Async entry point - the work never awaits, so it runs inline"""
+    return _segment_customer_impl(data)
+
 # Synchronous wrapper
 def segment_customer_sync(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Synchronous wrapper for the async function"""
-    import asyncio
-    return asyncio.run(segment_customer(data))
+    """Synchronous entry point - calls the core directly, no event loop per call"""
+    return _segment_customer_impl(data)
+
+# (segment, sub_segment) per batch segment code: the six primary segments,
+# then the recency refinements (lapsed VIP/Loyal, dormant, cooling)
+_SEGMENT_CODES = (
+    ('VIP', 'Platinum'), ('VIP', 'Gold'), ('Loyal', 'Regular'),
+    ('Active', 'Occasional'), ('New', 'First-time'), ('Prospect', 'Potential'),
+    ('At Risk', LAPSED_SUB_SEGMENTS['Platinum']), ('At Risk', LAPSED_SUB_SEGMENTS['Gold']),
+    ('At Risk', LAPSED_SUB_SEGMENTS['Regular']),
+    ('Dormant', 'Inactive'),
+    ('Loyal', 'Cooling'), ('Active', 'Cooling'), ('New', 'Cooling'), ('Prospect', 'Cooling'),
+)
+_LOYALTY_STATUSES = ('Customer', 'Advocate', 'Champion')
+
+def _float_array(values: List[Any]):
+    """float64 array of Python numbers; anything else raises, as the scalar comparisons would"""
+    if not all(type(value) in (int, float, bool) for value in values):
+        raise TypeError('non-numeric value')
+    return np.array(values, np.float64)
+
+def _batch_columns(customers: List[Dict[str, Any]]):
+    """Numeric inputs as NumPy columns, plus the pass-through fields (raises on malformed input)"""
+    purchases = [customer.get('purchase_history', {}) for customer in customers]
+    engagement = [customer.get('engagement_metrics', {}) for customer in customers]
+    demographics = [customer.get('demographic_data', {}) for customer in customers]
+    values = {
+        key: [section.get(key, 0) for section in sections]
+        for sections, keys in (
+            (purchases, ('total_orders', 'lifetime_value', 'average_order_value',
+                         'days_since_last_order', 'orders_per_month')),
+            (engagement, ('email_open_rate', 'click_through_rate', 'app_usage_days_per_month',
+                          'support_tickets_last_90_days', 'reviews_written', 'referrals_made')),
+        )
+        for key in keys
+    }
+    columns = {key: _float_array(column) for key, column in values.items()}
+    # potential_value stays an int on the scalar path while its factors are ints
+    int_columns = {
+        key: np.array([type(value) is not float for value in values[key]], bool)
+        for key in ('average_order_value', 'orders_per_month')
+    }
+    account_ages = [section.get('account_age_months', 0) for section in demographics]
+    channels = [section.get('preferred_channel', 'web') for section in demographics]
+    return columns, int_columns, account_ages, channels
+
+def segment_customer_batch(customers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Segment many customers at once; results match segment_customer_sync per customer.
+    Segments, tiers and churn scores are computed as NumPy masks over the whole batch.
+    """
+    if np is None or not customers:
+        return [_segment_customer_impl(customer) for customer in customers]
+    try:
+        columns, int_columns, account_ages, channels = _batch_columns(customers)
+    except Exception:
+        # A malformed customer - let each one report its own error
+        return [_segment_customer_impl(customer) for customer in customers]
+
+    lifetime_value = columns['lifetime_value']
+    frequency = columns['orders_per_month']
+    days = columns['days_since_last_order']
+    open_rate = columns['email_open_rate']
+    app_days = columns['app_usage_days_per_month']
+
+    # Primary segment, then the recency refinement, as indexes into _SEGMENT_CODES
+    primary = np.select([
+        (lifetime_value >= 10000) & (frequency >= 2),
+        (lifetime_value >= 5000) & (frequency >= 1),
+        (lifetime_value >= 2000) | (frequency >= 1),
+        columns['total_orders'] >= 2,
+        columns['total_orders'] == 1,
+    ], [0, 1, 2, 3, 4], 5)
+    codes = np.where(
+        days > 180,
+        np.where(primary <= 2, primary + 6, 9),
+        np.where((days > 90) & (primary >= 2), primary + 8, primary)
+    )
+
+    churn_scores = ((days > 60) * 30 + (days > 120) * 30 + (open_rate < 0.1) * 20 + (app_days < 2) * 20
+                    + (columns['support_tickets_last_90_days'] > 3) * 15 + (frequency < 0.5) * 15)
+    # Band index = thresholds passed, the vector form of the bisect lookups
+    tiers = (lifetime_value[:, None] >= LTV_THRESHOLDS).sum(axis=1)
+    value_levels = (lifetime_value[:, None] >= VALUE_THRESHOLDS).sum(axis=1)
+    activity_levels = (frequency[:, None] >= ACTIVITY_THRESHOLDS).sum(axis=1)
+    engagement_levels = (open_rate[:, None] > ENGAGEMENT_THRESHOLDS).sum(axis=1)
+    loyalty_levels = np.where(columns['referrals_made'] > 2, 2, np.where(columns['reviews_written'] > 3, 1, 0))
+    churn_levels = (churn_scores[:, None] >= CHURN_THRESHOLDS).sum(axis=1)
+
+    # New and Active customers (codes 3, 4, 11, 12) are valued on two years of average orders
+    average_order = columns['average_order_value']
+    new_or_active = np.isin(codes, (3, 4, 11, 12))
+    # inf/nan inputs give nan as on the scalar path, which does not warn about it
+    with np.errstate(invalid='ignore'):
+        potential = np.where(new_or_active, average_order * 12 * 2, average_order * frequency * 12)
+        engagement_scores = open_rate * 30 + columns['click_through_rate'] * 30 + (app_days / 30) * 40
+    int_potential = int_columns['average_order_value'] & (new_or_active | int_columns['orders_per_month'])
+
+    timestamp, next_review_date = now_and_offset_iso(NEXT_REVIEW_DELTA)
+    results = []
+    for (code, churn_score, tier, value_level, activity_level, engagement_level, loyalty_level,
+         churn_level, potential_value, int_potential_value, engagement_score, account_age_months,
+         preferred_channel) in zip(
+            codes.tolist(), churn_scores.tolist(), tiers.tolist(), value_levels.tolist(),
+            activity_levels.tolist(), engagement_levels.tolist(), loyalty_levels.tolist(),
+            churn_levels.tolist(), potential.tolist(), int_potential.tolist(), engagement_scores.tolist(),
+            account_ages, channels):
+        segment, sub_segment = _SEGMENT_CODES[code]
+        results.append({
+            "success": True,
+            "timestamp": timestamp,
+            "data": {
+                'segment': segment,
+                'sub_segment': sub_segment,
+                'lifetime_value_tier': LTV_TIERS[tier],
+                'churn_risk': CHURN_RISKS[churn_level],
+                'churn_score': churn_score,
+                'recommendations': _recommendations(segment, preferred_channel),
+                'profile_summary': {
+                    'value_indicator': VALUE_INDICATORS[value_level],
+                    'activity_level': ACTIVITY_LEVELS[activity_level],
+                    'engagement_level': ENGAGEMENT_LEVELS[engagement_level],
+                    'loyalty_status': _LOYALTY_STATUSES[loyalty_level],
+                    'preferred_channel': preferred_channel,
+                    'customer_since': f"{account_age_months} months"
+                },
+                'potential_value': int(potential_value) if int_potential_value else round(potential_value, 2),
+                'engagement_score': round(engagement_score, 2),
+                'segment_confidence': 0.85,
+                'next_review_date': next_review_date
+            }
+        })
+    return results
 
-__all__ = ['segment_customer', 'segment_customer_sync']
\ No newline at end of file
+__all__ = ['segment_customer', 'segment_customer_sync', 'segment_customer_batch']
\ No newline at end of file
@@ -10,8 +10,44 @@ import json
 from datetime import datetime
 import random
 import hashlib
-
-async def send_notification(data: Dict[str, Any]) -> Dict[str, Any]:
+from types import MappingProxyType
+
+try:
+    from services._clock import now_iso
+except ImportError:  # loaded with the services directory itself on sys.path
+    from _clock import now_iso
+
+# Recipient field -> channel it enables, in fallback preference order
+RECIPIENT_CHANNELS = (
+    ('email', 'email'),
+    ('phone', 'sms'),
+    ('device_token', 'push'),
+    ('slack_webhook', 'slack'),
+)
+
+# Simulated delivery time range in seconds per channel; others take 1s
+DELIVERY_RANGES = MappingProxyType({
+    'email': (0.5, 2.0),
+    'sms': (0.1, 0.5),
+    'push': (0.05, 0.2),
+    'slack': (0.2, 0.8)
+})
+
+# Delivery receipt details per channel; others are 'Internal' and free
+PROVIDERS = MappingProxyType({
+    'email': 'SendGrid',
+    'sms': 'Twilio',
+    'push': 'Firebase',
+    'slack': 'Slack API'
+})
+COSTS = MappingProxyType({
+    'email': 0.001,
+    'sms': 0.0075,
+    'push': 0.0001,
+    'slack': 0
+})
+
+def _send_notification_impl(data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Send various types of notifications (email, SMS, push) based on event type.
 
@@ -28,20 +64,12 @@ async def send_notification(data: Dict[str, Any]) -> Dict[str, Any]:
         order_data = data.get('order_data', {})
         priority = data.get('priority', 'normal')
 
-        # Generate notification ID
-        timestamp = datetime.now().isoformat()
-        notification_id = hashlib.md5(f"{timestamp}{recipient}".encode()).hexdigest()[:12]
+        # Generate notification ID; this one clock read also stamps the receipt and envelope
+        timestamp = now_iso()
+        notification_id = hashlib.blake2b(f"{timestamp}{recipient}".encode(), digest_size=6).hexdigest()
 
         # Determine recipient channels
-        channels_available = []
-        if recipient.get('email'):
-            channels_available.append('email')
-        if recipient.get('phone'):
-            channels_available.append('sms')
-        if recipient.get('device_token'):
-            channels_available.append('push')
-        if recipient.get('slack_webhook'):
-            channels_available.append('slack')
+        channels_available = [channel for field, channel in RECIPIENT_CHANNELS if recipient.get(field)]
 
         # Select best channel based on priority and type
         channel_used = notification_type
@@ -68,13 +96,13 @@ async def send_notification(data: Dict[str, Any]) -> Dict[str, Any]:
                     message = f"Your order #{order_id} has been delivered successfully."
 
         # Simulate delivery time based on channel
-        delivery_times = {
-            'email': random.uniform(0.5, 2.0),
-            'sms': random.uniform(0.1, 0.5),
-            'push': random.uniform(0.05, 0.2),
-            'slack': random.uniform(0.2, 0.8)
-        }
-        delivery_time = delivery_times.get(channel_used, 1.0)
+        # Only the chosen channel's time is drawn (random.uniform's formula, inlined)
+        delivery_range = DELIVERY_RANGES.get(channel_used)
+        if delivery_range:
+            low, high = delivery_range
+            delivery_time = low + (high - low) * random.random()
+        else:
+            delivery_time = 1.0
 
         # Check for delivery issues (simulated)
         delivery_status = 'delivered'
@@ -114,24 +142,14 @@ async def send_notification(data: Dict[str, Any]) -> Dict[str, Any]:
         # Add delivery receipt if successful
         if delivery_status == 'delivered':
             result['delivery_receipt'] = {
-                'delivered_at': datetime.now().isoformat(),
-                'provider': {
-                    'email': 'SendGrid',
-                    'sms': 'Twilio',
-                    'push': 'Firebase',
-                    'slack': 'Slack API'
-                }.get(channel_used, 'Internal'),
-                'cost': {
-                    'email': 0.001,
-                    'sms': 0.0075,
-                    'push': 0.0001,
-                    'slack': 0
-                }.get(channel_used, 0)
+                'delivered_at': timestamp,
+                'provider': PROVIDERS.get(channel_used, 'Internal'),
+                'cost': COSTS.get(channel_used, 0)
             }
 
         return {
             "success": True,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp,
             "data": result
         }
 
@@ -139,13 +157,16 @@ async def send_notification(data: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "success": False,
             "error": str(e),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
 
+async def send_notification(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Async entry point - the work never awaits, so it runs inline"""
+    return _send_notification_impl(data)
+
 # Synchronous wrapper
 def send_notification_sync(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Synchronous wrapper for the async function"""
-    import asyncio
-    return asyncio.run(send_notification(data))
+    """Synchronous entry point - calls the core directly, no event loop per call"""
+    return _send_notification_impl(data)
 
 __all__ = ['send_notification', 'send_notification_sync']
\ No newline at end of file
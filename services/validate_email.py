@@ -6,13 +6,22 @@ Description: Validate email addresses and check format compliance
 Generated: 2025-09-19T16:21:11.091812
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import json
-import asyncio
+import re
 from datetime import datetime
 
+try:
+    from services._clock import now_iso
+except ImportError:  # loaded with the services directory itself on sys.path
+    from _clock import now_iso
+
+# local@domain.tld: no whitespace or extra '@', local part up to 64 chars,
+# a dot in the domain and a TLD of 2+ chars. Used with fullmatch
+_EMAIL_RE = re.compile(r'[^\s@]{1,64}@[^\s@]{1,255}\.[^\s@]{2,}')
+
 # AI-Generated Implementation
-async def validate_email(data: Dict[str, Any]) -> Dict[str, Any]:
+def _validate_email_impl(data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Validate email addresses and check format compliance
     
@@ -31,12 +40,9 @@ async def validate_email(data: Dict[str, Any]) -> Dict[str, Any]:
         warnings = []
         
         # AI-generated validation rules
-        if 'email' in locals() and '@' not in str(email):
+        if not _EMAIL_RE.fullmatch(str(email)):
             errors.append('Invalid email format')
         
-        if 'phone' in locals() and len(str(phone).replace('-', '')) < 10:
-            warnings.append('Phone number may be incomplete')
-        
         result = {
             'valid': len(errors) == 0,
             'errors': errors,
@@ -46,7 +52,7 @@ async def validate_email(data: Dict[str, Any]) -> Dict[str, Any]:
         # Return results
         return {
             "success": True,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "data": result
         }
         
@@ -54,13 +60,42 @@ async def validate_email(data: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "success": False,
             "error": str(e),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
 
+async def validate_email(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Async entry point - the work never awaits, so it runs inline"""
+    return _validate_email_impl(data)
+
 # Synchronous wrapper for compatibility
 def validate_email_sync(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Synchronous wrapper for the async function"""
-    return asyncio.run(validate_email(data))
+    """Synchronous entry point - calls the core directly, no event loop per call"""
+    return _validate_email_impl(data)
+
+def validate_email_batch(requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Validate many addresses at once; results match validate_email_sync per request.
+    One compiled pattern and one timestamp serve the whole batch.
+    """
+    try:
+        matches = [_EMAIL_RE.fullmatch(str(data.get('email', ''))) for data in requests]
+    except Exception:
+        # A malformed request - let each one report its own error
+        return [_validate_email_impl(data) for data in requests]
+
+    timestamp = now_iso()
+    return [
+        {
+            "success": True,
+            "timestamp": timestamp,
+            "data": {
+                'valid': match is not None,
+                'errors': [] if match else ['Invalid email format'],
+                'warnings': []
+            }
+        }
+        for match in matches
+    ]
 
 # Export the service
-__all__ = ['validate_email', 'validate_email_sync']
+__all__ = ['validate_email', 'validate_email_sync', 'validate_email_batch']
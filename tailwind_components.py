@@ -10,6 +10,22 @@ from presentation_layer import UIRenderer
 class TailwindRenderer(UIRenderer):
     """Tailwind CSS renderer implementation"""
 
+    # Map component types to render methods
+    RENDER_METHODS = {
+        'page': 'render_page',
+        'navbar': 'render_navbar',
+        'hero': 'render_hero',
+        'card': 'render_card',
+        'button': 'render_button',
+        'grid': 'render_grid',
+        'table': 'render_table',
+        'form': 'render_form',
+        'badge': 'render_badge',
+        'alert': 'render_alert',
+        'metric': 'render_metric',
+        'container': 'render_container'
+    }
+
     def render_page(self, data: Dict) -> str:
         """Render a complete page with Tailwind CSS"""
         title = data.get('title', 'DBBasic')
@@ -377,27 +393,9 @@ class TailwindRenderer(UIRenderer):
             return ''.join([self.render(item) for item in data])
 
         if isinstance(data, dict):
-            component_type = data.get('type', '')
-
-            # Map component types to render methods
-            renderers = {
-                'page': self.render_page,
-                'navbar': self.render_navbar,
-                'hero': self.render_hero,
-                'card': self.render_card,
-                'button': self.render_button,
-                'grid': self.render_grid,
-                'table': self.render_table,
-                'form': self.render_form,
-                'badge': self.render_badge,
-                'alert': self.render_alert,
-                'metric': self.render_metric,
-                'container': self.render_container
-            }
-
-            renderer = renderers.get(component_type)
+            renderer = self._DISPATCH.get(data.get('type', ''))
             if renderer:
-                return renderer(data)
+                return renderer(self, data)
 
         return str(data)
 
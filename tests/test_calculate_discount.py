@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for Service: calculate-discount
+Description: Loyalty discount (premium 15%, gold 10%, silver 5%) plus 5% for orders over $500
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "services"))
+
+from calculate_discount import calculate_discount, calculate_discount_sync
+
+class TestCalculateDiscount:
+    """Test cases for calculate_discount service"""
+
+    @pytest.mark.parametrize("customer_type,order_amount,percentage,final_price", [
+        ("premium", 100, 15.0, 85.0),
+        ("gold", 100, 10.0, 90.0),
+        ("silver", 100, 5.0, 95.0),
+        ("bronze", 100, 0.0, 100.0),
+        ("premium", 1000, 20.0, 800.0),
+        (None, 600, 5.0, 570.0),
+    ])
+    def test_discount_rules(self, customer_type, order_amount, percentage, final_price):
+        """Loyalty rate plus the large-order bonus"""
+        result = calculate_discount_sync({"customer_type": customer_type, "order_amount": order_amount})
+
+        assert result["success"] is True
+        assert result["data"]["discount_percentage"] == percentage
+        assert result["data"]["final_price"] == final_price
+        assert result["data"]["discount_amount"] == round(order_amount - final_price, 2)
+
+    @pytest.mark.asyncio
+    async def test_async_matches_sync(self):
+        """Async entry point returns the same data as the sync wrapper"""
+        test_data = {"customer_tier": "Gold", "order_total": 750.5}
+        result = await calculate_discount(test_data)
+
+        assert result["success"] is True
+        assert result["data"] == calculate_discount_sync(test_data)["data"]
+        assert result["data"]["discount_percentage"] == 15.0
+
+    @pytest.mark.parametrize("test_data", [
+        {}, {"order_amount": "100"}, {"order_amount": -5}, {"order_amount": True},
+        "not a dict", {"customer_type": [1], "order_amount": 5},
+    ])
+    def test_invalid_input(self, test_data):
+        """Missing or non-numeric amounts and malformed requests are reported, not raised"""
+        result = calculate_discount_sync(test_data)
+
+        assert result["success"] is False
+        assert "error" in result
+        assert "timestamp" in result
+
+if __name__ == "__main__":
+    # Run tests directly
+    pytest.main([__file__, "-v"])
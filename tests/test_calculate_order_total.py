@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for Service: calculate-order-total
+Description: Subtotal, location-based tax, volume and loyalty discounts; batch path vs single path
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "services"))
+
+from calculate_order_total import calculate_order_total_sync, calculate_order_total_batch
+
+ORDERS = [
+    {"items": [{"price": 19.99, "quantity": 3}], "customer_location": {"state": "CA", "city": "San Francisco"}},
+    {"items": [{"price": 400, "quantity": 2}], "customer_location": {"state": "NY", "city": "New York"}, "customer_tier": "gold"},
+    {"items": [{"price": 1200}], "customer_location": {"state": "ZZ"}, "customer_tier": "platinum"},
+    {"items": [{"price": 800}], "customer_location": {"state": "WA"}, "apply_discounts": False},
+    {"items": [], "customer_location": {"state": "OR"}},
+]
+
+def _without_timestamp(result):
+    return {k: v for k, v in result.items() if k != "timestamp"}
+
+def _assert_batch_as_scalar(orders):
+    # JSON compares 800 with 800.0 and nan with nan the way a client would see them
+    batch = calculate_order_total_batch(orders)
+    assert [json.dumps(_without_timestamp(r)) for r in batch] == \
+        [json.dumps(_without_timestamp(calculate_order_total_sync(order))) for order in orders]
+    return batch
+
+class TestCalculateOrderTotal:
+    """Test cases for calculate_order_total service"""
+
+    def test_tax_and_discounts(self):
+        """City tax stacks on state tax; volume and tier discounts add up"""
+        result = calculate_order_total_sync(ORDERS[1])["data"]
+
+        assert result["tax_rate"] == 12.5
+        assert result["discount_amount"] == 80.0
+        assert result["discounts_applied"] == ["Volume discount (5%)", "Gold member discount (5%)"]
+
+    def test_batch_keeps_int_results(self):
+        """Integer prices with no tax or discount come back as ints, as on the single path"""
+        result = calculate_order_total_batch([ORDERS[3], ORDERS[4]])
+
+        assert type(result[0]["data"]["subtotal"]) is int
+        assert type(result[0]["data"]["discount_amount"]) is int
+        assert type(result[1]["data"]["total"]) is int
+
+    def test_batch_across_locations_and_tiers(self):
+        """City tax, unknown states, tiers and disabled discounts total as on the scalar path"""
+        _assert_batch_as_scalar(ORDERS)
+
+    @pytest.mark.parametrize("price", [500, 500.01, 1000, 1000.01])
+    def test_batch_volume_discount_edges(self, price):
+        """Volume discounts start strictly above 500 and 1000, with or without a tier"""
+        _assert_batch_as_scalar([
+            {"items": [{"price": price}]},
+            {"items": [{"price": price}], "customer_tier": "gold"},
+            {"items": [{"price": price}], "customer_tier": "silver"},
+        ])
+
+    def test_batch_falsy_apply_discounts(self):
+        """Any falsy apply_discounts turns discounts off, and the zero discount stays an int"""
+        batch = _assert_batch_as_scalar([
+            {"items": [{"price": 1500}], "customer_tier": "platinum", "apply_discounts": flag}
+            for flag in (False, 0, "", None, [])
+        ])
+
+        assert all(r["data"]["discount_amount"] == 0 and r["data"]["discounts_applied"] == [] for r in batch)
+
+    def test_batch_non_finite_prices(self):
+        """An inf or nan price does not turn a zero loyalty rate into a nan discount"""
+        batch = _assert_batch_as_scalar([
+            {"items": [{"price": float("inf")}]},
+            {"items": [{"price": float("inf")}], "customer_tier": "gold"},
+            {"items": [{"price": float("nan")}]},
+            {"items": [{"price": 20}]},
+        ])
+
+        assert batch[0]["data"]["discount_amount"] == float("inf")
+        assert batch[0]["data"]["discounts_applied"] == ["Volume discount (10%)"]
+        assert batch[2]["data"]["discount_amount"] == 0
+
+    def test_batch_bool_prices(self):
+        """Booleans multiply as 0/1 like the scalar arithmetic, keeping int results"""
+        batch = _assert_batch_as_scalar([
+            {"items": [{"price": True, "quantity": 3}], "customer_location": {"state": "OR"}},
+            {"items": [{"price": 600, "quantity": False}]},
+        ])
+
+        assert batch[0]["data"]["total"] == 3
+
+    def test_batch_with_malformed_order(self):
+        """A bad order fails with the scalar path's error; the rest of the batch still totals"""
+        orders = [ORDERS[0], {"items": [{"price": "free"}]}, {"items": [{"price": "5"}]}, {"items": [{"price": None}]}]
+        batch = _assert_batch_as_scalar(orders)
+
+        assert batch[0]["success"] is True
+        assert [r["success"] for r in batch[1:]] == [False, False, False]  # numeric strings are not coerced
+
+if __name__ == "__main__":
+    # Run tests directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for Service: detect-fraud
+Description: Fraud score, risk band and score breakdown; packed 'flags' input vs nested booleans
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "services"))
+
+from detect_fraud import detect_fraud_sync, FLAG_CVV_FAILED, FLAG_PO_BOX, FLAG_VPN
+
+RISKY_ORDER = {
+    "order_data": {"total": 900},
+    "customer_data": {"average_order_value": 100, "account_age_days": 400, "previous_orders": 3},
+    "payment_data": {"cvv_verification_failed": True},
+    "shipping_data": {"is_po_box": True},
+    "device_data": {"vpn_detected": True},
+}
+
+def _without_timestamp(result):
+    return {k: v for k, v in result.items() if k != "timestamp"}
+
+class TestDetectFraud:
+    """Test cases for detect_fraud service"""
+
+    def test_risky_order(self):
+        """Signals add up, map to a risk band and feed the breakdown"""
+        result = detect_fraud_sync(RISKY_ORDER)["data"]
+
+        assert result["fraud_score"] == 95
+        assert result["risk_level"] == "critical"
+        assert result["action_recommended"] == "block"
+        assert result["reason_codes"] == ["HIGH_ORDER_VALUE", "CVV_FAILED", "PO_BOX_HIGH_VALUE", "VPN_DETECTED"]
+        assert result["score_breakdown"]["order_risk"] == 30
+        assert result["score_breakdown"]["shipping_risk"] == 10
+
+    @pytest.mark.parametrize("score_data,risk_level", [
+        ({}, "minimal"),
+        ({"payment_data": {"method": "prepaid_card"}}, "low"),
+        ({"shipping_data": {"country": "NG"}}, "medium"),
+    ])
+    def test_risk_bands(self, score_data, risk_level):
+        """Band boundaries are inclusive at 15 and 30"""
+        result = detect_fraud_sync({"customer_data": {"account_age_days": 400}, **score_data})
+
+        assert result["data"]["risk_level"] == risk_level
+
+    def test_flags_match_nested_booleans(self):
+        """A packed flags int scores exactly like the nested booleans it replaces"""
+        packed = {
+            "order_data": RISKY_ORDER["order_data"],
+            "customer_data": RISKY_ORDER["customer_data"],
+            "flags": FLAG_CVV_FAILED | FLAG_PO_BOX | FLAG_VPN,
+        }
+
+        assert _without_timestamp(detect_fraud_sync(packed)) == _without_timestamp(detect_fraud_sync(RISKY_ORDER))
+
+if __name__ == "__main__":
+    # Run tests directly
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Tests for Service: segment-customer
+Description: Segment, tier and churn scoring; batch path vs single path
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add services directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "services"))
+
+from segment_customer import segment_customer_sync, segment_customer_batch
+
+CUSTOMERS = [
+    {"purchase_history": {"lifetime_value": 12000, "orders_per_month": 3, "days_since_last_order": 10}},
+    {"purchase_history": {"lifetime_value": 6000, "orders_per_month": 1, "days_since_last_order": 200}},
+    {"purchase_history": {"lifetime_value": 800, "total_orders": 3, "days_since_last_order": 95},
+     "demographic_data": {"preferred_channel": "mobile"}},
+    {"purchase_history": {"total_orders": 1, "average_order_value": 40},
+     "engagement_metrics": {"email_open_rate": 0.4, "app_usage_days_per_month": 12}},
+    {},
+]
+
+def _without_timestamps(result):
+    result = {k: v for k, v in result.items() if k != "timestamp"}
+    if "data" in result:
+        result["data"] = {k: v for k, v in result["data"].items() if k != "next_review_date"}
+    return result
+
+def _batch_and_single(customers):
+    """Each customer's result from one batch and from its own call, as JSON (960 vs 960.0, nan == nan)"""
+    batch = [json.dumps(_without_timestamps(r)) for r in segment_customer_batch(customers)]
+    single = [json.dumps(_without_timestamps(segment_customer_sync(customer))) for customer in customers]
+    return batch, single
+
+class TestSegmentCustomer:
+    """Test cases for segment_customer service"""
+
+    @pytest.mark.parametrize("customer,segment,sub_segment,tier", [
+        (CUSTOMERS[0], "VIP", "Platinum", "Diamond"),
+        (CUSTOMERS[1], "At Risk", "Lapsed Gold", "Platinum"),
+        (CUSTOMERS[2], "Active", "Cooling", "Silver"),
+        (CUSTOMERS[3], "New", "First-time", "Bronze"),
+        (CUSTOMERS[4], "Prospect", "Potential", "Bronze"),
+    ])
+    def test_segments(self, customer, segment, sub_segment, tier):
+        """Primary segment, recency refinement and lifetime value tier"""
+        result = segment_customer_sync(customer)["data"]
+
+        assert result["segment"] == segment
+        assert result["sub_segment"] == sub_segment
+        assert result["lifetime_value_tier"] == tier
+
+    @pytest.mark.parametrize("days", [90, 91, 180, 181])
+    def test_batch_recency_refinement(self, days):
+        """Every primary segment is refined past 90 and 180 days exactly as one customer at a time"""
+        customers = [
+            {"purchase_history": {**customer.get("purchase_history", {}), "days_since_last_order": days}}
+            for customer in CUSTOMERS
+        ]
+        batch, single = _batch_and_single(customers)
+
+        assert batch == single
+
+    def test_batch_potential_value_types(self):
+        """potential_value is an int only while its factors are; New/Active ignore orders_per_month"""
+        customers = [
+            {"purchase_history": {"lifetime_value": 6000, "orders_per_month": 1, "average_order_value": 120}},
+            {"purchase_history": {"lifetime_value": 6000, "orders_per_month": 1.5, "average_order_value": 120}},
+            {"purchase_history": {"total_orders": 1, "orders_per_month": 0.5, "average_order_value": 35}},
+            {"purchase_history": {"total_orders": 1, "average_order_value": 35.0}},
+        ]
+        batch, single = _batch_and_single(customers)
+
+        assert batch == single
+        assert [type(json.loads(r)["data"]["potential_value"]) for r in batch] == [int, float, int, float]
+
+    def test_batch_non_finite_metrics(self):
+        """inf ranks above every threshold and nan below, on both paths"""
+        inf, nan = float("inf"), float("nan")
+        customers = [
+            {"purchase_history": {"lifetime_value": inf, "orders_per_month": inf, "days_since_last_order": inf}},
+            {"purchase_history": {"lifetime_value": -inf, "average_order_value": inf}},
+            {"engagement_metrics": {"email_open_rate": nan, "app_usage_days_per_month": nan}},
+        ]
+        batch, single = _batch_and_single(customers)
+
+        assert batch == single
+        assert json.loads(batch[0])["data"]["lifetime_value_tier"] == "Diamond"
+        assert json.loads(batch[0])["data"]["segment"] == "At Risk"
+
+    def test_nan_lands_in_bottom_band(self):
+        """NaN reaches no threshold on either path, as the >= comparisons did"""
+        nan = float("nan")
+        customer = {"purchase_history": {"lifetime_value": nan, "orders_per_month": nan}}
+
+        single = segment_customer_sync(customer)
+        batch = segment_customer_batch([customer, CUSTOMERS[0]])[0]
+
+        assert single["data"]["lifetime_value_tier"] == "Bronze"
+        assert single["data"]["profile_summary"]["value_indicator"] == "Low Value"
+        assert single["data"]["profile_summary"]["activity_level"] == "Inactive"
+        assert json.dumps(_without_timestamps(batch)) == json.dumps(_without_timestamps(single))
+
+    def test_batch_bool_metrics(self):
+        """Booleans count as 0/1: total_orders=True is a first-time customer, as on the scalar path"""
+        customers = [
+            {"purchase_history": {"total_orders": True, "average_order_value": True}},
+            {"purchase_history": {"lifetime_value": False, "orders_per_month": True}},
+        ]
+        batch, single = _batch_and_single(customers)
+
+        assert batch == single
+        assert json.loads(batch[0])["data"]["segment"] == "New"
+
+    def test_batch_with_malformed_customer(self):
+        """A bad customer fails with the scalar path's error without sinking the rest of the batch"""
+        customers = [CUSTOMERS[0], {"purchase_history": {"lifetime_value": "5000"}},
+                     {"purchase_history": {"days_since_last_order": None}}]
+        batch, single = _batch_and_single(customers)
+
+        assert batch == single
+        assert [json.loads(r)["success"] for r in batch] == [True, False, False]
+
+if __name__ == "__main__":
+    # Run tests directly
+    pytest.main([__file__, "-v"])
@@ -14,7 +14,7 @@ from pathlib import Path
 # Add services directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "services"))
 
-from validate_email import validate_email, validate_email_sync
+from validate_email import validate_email, validate_email_sync, validate_email_batch
 
 class TestValidateEmail:
     """Test cases for validate_email service"""
@@ -69,6 +69,31 @@ class TestValidateEmail:
         assert "success" in result
         assert "timestamp" in result
 
+    @pytest.mark.parametrize("email,valid", [
+        ("test@example.com", True),
+        ("user@domain.co.uk", True),
+        ("", False),
+        ("no-at-sign.com", False),
+        ("two@@example.com", False),
+        ("user@localhost", False),
+        ("user@example.c", False),
+        ("user name@example.com", False),
+        ("a" * 65 + "@example.com", False),
+    ])
+    def test_email_format(self, email, valid):
+        """Addresses must be local@domain.tld with no whitespace or stray '@'"""
+        result = validate_email_sync({"email": email})
+
+        assert result["data"]["valid"] is valid
+        assert result["data"]["errors"] == ([] if valid else ["Invalid email format"])
+
+    def test_batch_matches_single(self):
+        """The batch path returns the same data as one call per address"""
+        requests = [{"email": "test@example.com"}, {"email": "bad"}, {}]
+        batch = validate_email_batch(requests)
+
+        assert [r["data"] for r in batch] == [validate_email_sync(r)["data"] for r in requests]
+
 if __name__ == "__main__":
     # Run tests directly
     pytest.main([__file__, "-v"])
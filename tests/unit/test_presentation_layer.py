@@ -172,6 +172,23 @@ class TestBootstrapComponents:
         assert 'id="test-div"' in html
         assert 'Test content' in html
 
+    def test_page_streams_into_one_buffer(self):
+        """Test a page's grid items are written into the caller's buffer, not rendered to strings and joined"""
+        calls = []
+
+        class CountingRenderer(ExtendedBootstrapRenderer):
+            def render(self, data):
+                calls.append(data)
+                return super().render(data)
+
+        data = {'type': 'page', 'components': [
+            {'type': 'grid', 'items': [{'type': 'alert', 'message': 'one'}, {'type': 'alert', 'message': 'two'}]}
+        ]}
+        html = CountingRenderer().render(data)
+        assert html == self.renderer.render(data)
+        assert 'one' in html and 'two' in html
+        assert calls == [data]
+
 
 class TestTailwindComponents:
     """Test Tailwind component rendering"""
@@ -221,6 +238,149 @@ class TestTailwindComponents:
         assert 'Item 3' in html
 
 
+class TestCompiledTemplates:
+    """Test compiling UI structures to static fragments"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        PresentationLayer.add_renderer('bootstrap', ExtendedBootstrapRenderer())
+
+    def test_static_structure_collapses(self):
+        """Test a structure without slots compiles to a single string"""
+        data = {'type': 'card', 'title': 'Static Card', 'body': 'Nothing dynamic'}
+        compiled = PresentationLayer.compile(data, 'bootstrap')
+        assert compiled.is_static
+        assert compiled.render() == PresentationLayer.render(data, 'bootstrap')
+
+    def test_slots_are_filled(self):
+        """Test slot values are bound at render time"""
+        data = {
+            'type': 'card',
+            'title': 'Operations',
+            'body': {'type': 'div', 'children': [{'type': 'slot', 'name': 'ops', 'default': '0'}]}
+        }
+        PresentationLayer.register_template('test:ops', data)
+        assert '<div  >0</div>' in PresentationLayer.render(data, 'bootstrap')
+        assert '<div  >42</div>' in PresentationLayer.render_compiled('test:ops', 'bootstrap', ops=42)
+        assert '<div  >0</div>' in PresentationLayer.render_compiled('test:ops', 'bootstrap')
+
+    def test_text_and_escaped_slots(self):
+        """Test text nodes and escape=True slots are HTML-escaped"""
+        data = {'type': 'div', 'children': [
+            {'type': 'text', 'text': '<b>&</b>'},
+            {'type': 'slot', 'name': 'user', 'default': '<anon>', 'escape': True}
+        ]}
+        PresentationLayer.register_template('test:user', data)
+        assert PresentationLayer.render_compiled('test:user', 'bootstrap') == '<div  >&lt;b&gt;&amp;&lt;/b&gt;&lt;anon&gt;</div>'
+        assert PresentationLayer.render_compiled('test:user', 'bootstrap', user='"x"').endswith('&quot;x&quot;</div>')
+
+    def test_render_bytes_matches_render(self):
+        """Test the bytes path produces the UTF-8 encoding of render()"""
+        data = {'type': 'div', 'children': ['caf\u00e9 ', {'type': 'slot', 'name': 'who', 'default': 'n\u00f8ne', 'escape': True}]}
+        compiled = PresentationLayer.compile(data, 'bootstrap')
+        assert compiled.render_bytes() == compiled.render().encode('utf-8')
+        assert compiled.render_bytes({'who': '<\u00e5>'}) == compiled.render({'who': '<\u00e5>'}).encode('utf-8')
+
+    def test_minijinja_backend_matches_python(self):
+        """Test the optional MiniJinja backend binds slots like the default one"""
+        pytest.importorskip('minijinja')
+        data = {'type': 'div', 'children': [
+            {'type': 'raw', 'content': '{{ not_a_var }}'},
+            {'type': 'slot', 'name': 'ops', 'default': '0'},
+            {'type': 'slot', 'name': 'user', 'default': '<anon>', 'escape': True}
+        ]}
+        PresentationLayer.register_template('test:minijinja', data)
+        expected = [PresentationLayer.render_compiled('test:minijinja'),
+                    PresentationLayer.render_compiled('test:minijinja', ops=7, user='<b>')]
+        PresentationLayer.set_backend('minijinja')
+        try:
+            assert PresentationLayer.render_compiled('test:minijinja') == expected[0]
+            assert PresentationLayer.render_compiled('test:minijinja', ops=7, user='<b>') == expected[1]
+        finally:
+            PresentationLayer.set_backend('python')
+
+    def test_compile_template_is_cached(self):
+        """Test compiling a registered template twice reuses the compiled form"""
+        PresentationLayer.register_template('test:cached', {'type': 'alert', 'message': 'Cached'})
+        assert PresentationLayer.compile_template('test:cached') is PresentationLayer.compile_template('test:cached')
+
+    def test_register_template_snapshots_and_replaces(self):
+        """Test edits to the caller's tree need a new register_template, which recompiles"""
+        data = {'type': 'alert', 'message': 'Before'}
+        PresentationLayer.register_template('test:edit', data)
+        assert 'Before' in PresentationLayer.render_compiled('test:edit')
+        data['message'] = 'After'
+        assert 'Before' in PresentationLayer.render_compiled('test:edit')
+        PresentationLayer.register_template('test:edit', data)
+        assert 'After' in PresentationLayer.render_compiled('test:edit')
+
+    def test_compile_cache_is_bounded(self):
+        """Test the compiled-template cache evicts beyond COMPILE_CACHE_SIZE"""
+        for i in range(PresentationLayer.COMPILE_CACHE_SIZE + 10):
+            PresentationLayer.register_template(f'test:bounded{i}', {'type': 'alert', 'message': f'Request {i}'})
+            PresentationLayer.compile_template(f'test:bounded{i}')
+        assert len(PresentationLayer._compiled) == PresentationLayer.COMPILE_CACHE_SIZE
+
+
+class TestEnhancedAttributes:
+    """Test attribute rendering in the enhanced renderer"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        from presentation_layer import BootstrapRenderer
+        from presentation_layer_extended import EnhancedBootstrapRenderer
+
+        class Renderer(EnhancedBootstrapRenderer, BootstrapRenderer):
+            pass
+
+        self.renderer = Renderer()
+
+    def test_equal_values_of_different_types(self):
+        """Test 1, 1.0 and True don't share a cached attribute string"""
+        for value, expected in [(1, '"1"'), (1.0, '"1.0"'), (True, '"True"'), (1, '"1"')]:
+            html = self.renderer.render({'type': 'span', 'id': value, 'data': {'x': value}, 'text': ''})
+            assert f'id={expected}' in html
+            assert f'data-x={expected}' in html
+
+    def test_all_on_attributes_are_event_handlers(self):
+        """Test standard and custom on* handlers are all emitted, in order"""
+        html = self.renderer.render({'type': 'span', 'onclick': 'a()', 'onmyevent': 'b()', 'text': ''})
+        assert 'onclick="a()" onmyevent="b()"' in html
+
+
+class TestComponentRegistry:
+    """Test the extended layer's component registry"""
+
+    def test_get_returns_editable_copies(self):
+        """Test each lookup is a fresh copy that reflects the current registration"""
+        from presentation_layer_extended import ComponentRegistry
+        first = ComponentRegistry.get('metric_card', id='revenue-card')
+        first['id'] = 'other'
+        assert ComponentRegistry.get('metric_card', id='revenue-card')['id'] == 'revenue-card'
+
+        original = ComponentRegistry.components['metric_card']
+        try:
+            ComponentRegistry.components['metric_card'] = {**original, 'type': 'div'}
+            assert ComponentRegistry.get('metric_card', id='revenue-card')['type'] == 'div'
+        finally:
+            ComponentRegistry.components['metric_card'] = original
+
+    def test_render_fills_placeholders(self):
+        """Test registered components render through a format string"""
+        from presentation_layer_extended import ComponentRegistry
+        ComponentRegistry.register('greeting', {'type': 'raw', 'content': '<p style="a{b}">Hi {{name}}</p>'})
+        assert PresentationLayer.compile_to_format(ComponentRegistry.components['greeting']) == '<p style="a{{b}}">Hi {name}</p>'
+        assert ComponentRegistry.render('greeting', name='Ada') == '<p style="a{b}">Hi Ada</p>'
+        assert ComponentRegistry.render('greeting') == '<p style="a{b}">Hi {{name}}</p>'
+
+    def test_list_overrides_merge_classes(self):
+        """Test unhashable overrides still merge classes"""
+        from presentation_layer_extended import ComponentRegistry
+        card = ComponentRegistry.get('metric_card', classes=['shadow'])
+        assert card['classes'] == ['metric-card', 'shadow']
+        card['id'] = 'mutable'
+
+
 class TestDataStructureConversion:
     """Test conversion from HTML to data structures"""
 
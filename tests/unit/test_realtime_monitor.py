@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Tests for the realtime monitor's dashboard content negotiation
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+pytest.importorskip('fastapi')
+import realtime_monitor
+
+
+class TestDashboardEncoding:
+    """Test picking a precompressed dashboard copy from Accept-Encoding"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.encoded = {'br': (b'br', '"br"'), 'gzip': (b'gz', '"gz"')}
+
+    @pytest.mark.parametrize('header,expected', [
+        ('gzip, deflate, br', 'br'),
+        ('gzip', 'gzip'),
+        ('br;q=0, gzip', 'gzip'),
+        ('*', 'br'),
+        ('identity', ''),
+        ('', ''),
+    ])
+    def test_best_accepted_coding(self, monkeypatch, header, expected):
+        """Test the best coding the client accepts is chosen"""
+        monkeypatch.setattr(realtime_monitor, 'DASHBOARD_ENCODED', self.encoded)
+        assert realtime_monitor._dashboard_encoding(header) == expected
+
+    def test_wildcard_respects_refused_codings(self, monkeypatch):
+        """Test '*' does not bring back a coding refused with q=0"""
+        monkeypatch.setattr(realtime_monitor, 'DASHBOARD_ENCODED', self.encoded)
+        assert realtime_monitor._dashboard_encoding('gzip;q=0, *') == 'br'
+        assert realtime_monitor._dashboard_encoding('br;q=0, gzip;q=0, *') == ''